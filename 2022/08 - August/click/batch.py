@@ -0,0 +1,75 @@
+import glob
+import os
+import time
+from multiprocessing import Pool
+from typing import Callable, Iterator
+
+GLOB_CHARS = "*?["
+
+
+def is_batch_input(name: str) -> bool:
+    """True if `name` is a directory or a glob pattern, rather than a single file"""
+    return os.path.isdir(name) or any(char in name for char in GLOB_CHARS)
+
+
+def expand_inputs(name: str, extension: str = ".csv") -> list[str]:
+    """Expands a glob pattern, or a directory (all its files with the given extension),
+    into a sorted list of file names. `**` in patterns matches sub-directories too.
+    """
+    pattern = os.path.join(name, f"*{extension}") if os.path.isdir(name) else name
+    return sorted(
+        file_name for file_name in glob.glob(pattern, recursive=True) if os.path.isfile(file_name)
+    )
+
+
+def is_up_to_date(in_file_name: str, out_file_name: str) -> bool:
+    """True if the output file exists, and is newer than the input file"""
+    try:
+        return os.path.getmtime(out_file_name) >= os.path.getmtime(in_file_name)
+    except OSError:
+        return False
+
+
+def chunk_offsets(file_name: str, start: int, chunk_size: int) -> list[int]:
+    """Splits a file, from byte `start`, into chunks of about `chunk_size` bytes, each ending
+    at a line break - so that the chunks of a large file can be processed in parallel.
+
+    Returns the offsets of the chunk boundaries: chunk `i` spans `offsets[i]:offsets[i + 1]`.
+    """
+    size = os.path.getsize(file_name)
+    offsets = [start]
+    with open(file_name, "rb") as f:
+        while offsets[-1] < size:
+            f.seek(min(offsets[-1] + chunk_size, size))
+            f.readline()
+            offsets.append(f.tell())
+    return offsets
+
+
+def run_batch(
+    func: Callable, tasks: list[tuple], workers: int = None, ordered: bool = False
+) -> Iterator[tuple[tuple, object, str | None, float]]:
+    """Calls `func(*args)` for each tuple of args in `tasks`, across a pool of `workers`
+    processes (one per CPU by default).
+
+    Yields `(args, result, error, seconds)` as each call finishes (or in the order of
+    `tasks`, if `ordered`). A call that raised has a `None` result and the exception's
+    message as `error`, so one bad file does not stop the whole batch. `func` must be
+    defined at the top level of a module, so it can be sent to the worker processes.
+    """
+    if not tasks:
+        return
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    with Pool(workers) as pool:
+        map_func = pool.imap if ordered else pool.imap_unordered
+        yield from map_func(_timed_call, [(func, args) for args in tasks])
+
+
+def _timed_call(task: tuple) -> tuple[tuple, object, str | None, float]:
+    func, args = task
+    start = time.perf_counter()
+    try:
+        result, error = func(*args), None
+    except Exception as ex:
+        result, error = None, str(ex) or type(ex).__name__
+    return args, result, error, time.perf_counter() - start
@@ -1,6 +1,12 @@
+import os
+import time
+
 import click
 
-from converters.csv_converter import convert_csv_to_json
+from batch import expand_inputs, is_batch_input, is_up_to_date, run_batch
+from converters.csv_converter import convert_csv, convert_csv_to_json_parallel
+from converters.enums import OutputFormat
+from converters.writers import EXTENSIONS
 
 
 @click.group(name="converters")
@@ -13,15 +19,17 @@ def converters_group():
     "--infile",
     "-i",
     "csv_file_name",
-    type=click.Path(exists=True, dir_okay=False),
-    help="specifies the input CSV file",
+    type=str,
+    help="specifies the input CSV file - or a directory or glob pattern (quoted) to convert "
+    "several files",
 )
 @click.option(
     "--outfile",
     "-o",
     "out_file_name",
-    type=click.Path(exists=False, dir_okay=False, writable=True),
-    help="specifies an output file - note that if the file exists, it will be overwritten",
+    type=click.Path(exists=False, writable=True),
+    help="specifies an output file - note that if the file exists, it will be overwritten "
+    "(an output directory when converting several files)",
 )
 @click.option(
     "--has-headers",
@@ -38,20 +46,141 @@ def converters_group():
     type=str,
     help="specify custom columns names for each column in the CSV input file",
 )
-def csv_to_json(csv_file_name, out_file_name, has_headers, custom_headers):
-    """Specify an input CSV file to convert to JSON.
+@click.option(
+    "--workers",
+    "-w",
+    default=None,
+    type=click.IntRange(1),
+    help="convert in parallel chunks, using this many worker processes (for large files) - "
+    "or the number of files converted at once, when converting several files",
+)
+@click.option(
+    "--format",
+    "-f",
+    "format_",
+    default=OutputFormat.json.name,
+    type=click.Choice([e.name for e in OutputFormat], case_sensitive=True),
+    help="output format - parquet and arrow require the pyarrow library",
+)
+@click.option(
+    "--infer-types",
+    is_flag=True,
+    default=False,
+    help=(
+        "infer int, float, bool and null values from a sample of rows, instead of using strings "
+        "(the inferred schema is cached in a .schema.json file next to the CSV file)"
+    ),
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="when converting several files, also convert files whose output is up to date",
+)
+def csv_to_json(
+    csv_file_name, out_file_name, has_headers, custom_headers, workers, format_, infer_types, force
+):
+    """Specify an input CSV file to convert to JSON (or another output format).
 
     If desired, you can provide custom column names using the `--columns` option.
 
     Note that if you do not specify custom headers using --columns, then you **must**
     use the --has-headers flag.
+
+    Use --workers for large files: the file is split in chunks that are converted in
+    parallel (this requires that no quoted values in the file contain line breaks, and is
+    only available for json and ndjson output).
+
+    To convert several files, use a directory (all its .csv files are converted) or a
+    quoted glob pattern such as 'data/*.csv' as the input, and a directory as the output:
+    files are converted across a pool of worker processes, and files whose output is newer
+    than the input are skipped (unless --force is used).
     """
-    convert_csv_to_json(
-        csv_file_name=csv_file_name,
-        out_file_name=out_file_name,
-        has_headers=has_headers,
-        custom_headers=custom_headers,
+    output_format = OutputFormat[format_]
+    if is_batch_input(csv_file_name):
+        _convert_batch(
+            in_file_names=expand_inputs(csv_file_name),
+            out_dir=out_file_name,
+            has_headers=has_headers,
+            custom_headers=custom_headers,
+            workers=workers,
+            output_format=output_format,
+            infer_types=infer_types,
+            force=force,
+        )
+        return
+
+    if not os.path.isfile(csv_file_name):
+        raise click.BadParameter(f"File '{csv_file_name}' does not exist.", param_hint="--infile")
+    if os.path.isdir(out_file_name):
+        raise click.BadParameter(f"File '{out_file_name}' is a directory.", param_hint="--outfile")
+    try:
+        if workers:
+            convert_csv_to_json_parallel(
+                csv_file_name=csv_file_name,
+                out_file_name=out_file_name,
+                has_headers=has_headers,
+                custom_headers=custom_headers,
+                workers=workers,
+                output_format=output_format,
+                infer_types=infer_types,
+            )
+        else:
+            convert_csv(
+                csv_file_name=csv_file_name,
+                out_file_name=out_file_name,
+                has_headers=has_headers,
+                custom_headers=custom_headers,
+                output_format=output_format,
+                infer_types=infer_types,
+            )
+    except (RuntimeError, ValueError) as ex:
+        raise click.ClickException(str(ex))
+
+
+def _convert_batch(
+    in_file_names: list[str],
+    out_dir: str,
+    has_headers: bool,
+    custom_headers: list[str],
+    workers: int,
+    output_format: OutputFormat,
+    infer_types: bool,
+    force: bool,
+):
+    if not in_file_names:
+        raise click.ClickException("No CSV files match the input.")
+    if not out_dir:
+        raise click.BadParameter("An output directory is required.", param_hint="--outfile")
+    os.makedirs(out_dir, exist_ok=True)
+
+    tasks = []
+    for in_file_name in in_file_names:
+        stem = os.path.splitext(os.path.basename(in_file_name))[0]
+        out_file_name = os.path.join(out_dir, f"{stem}{EXTENSIONS[output_format]}")
+        if not force and is_up_to_date(in_file_name, out_file_name):
+            click.echo(f"skipped {in_file_name} (up to date)", err=True)
+            continue
+        tasks.append(
+            (in_file_name, out_file_name, has_headers, custom_headers, output_format, infer_types)
+        )
+
+    start = time.perf_counter()
+    failed = 0
+    for i, (args, _, error, seconds) in enumerate(run_batch(convert_csv, tasks, workers), 1):
+        in_file_name, out_file_name = args[:2]
+        status = f"failed: {error}" if error else f"{out_file_name} ({seconds:.2f} s)"
+        click.echo(f"[{i}/{len(tasks)}] {in_file_name} -> {status}", err=True)
+        failed += bool(error)
+
+    click.echo(
+        f"converted {len(tasks) - failed} of {len(in_file_names)} files "
+        f"in {time.perf_counter() - start:.2f} s "
+        f"({len(in_file_names) - len(tasks)} up to date, {failed} failed)",
+        err=True,
     )
+    if failed:
+        raise click.ClickException(f"{failed} file(s) could not be converted.")
 
 
 converters_group.add_command(csv_to_json)
@@ -0,0 +1,104 @@
+import re
+from typing import Callable, Iterable
+
+from converters.enums import ColumnType
+
+SAMPLE_SIZE = 1_000  # rows sampled to infer column types
+
+# values with leading zeros (zip codes, ids, ...) are not numbers - they would lose their zeros
+_INT_RE = re.compile(r"[-+]?(?:0|[1-9]\d*)")
+_FLOAT_RE = re.compile(r"[-+]?(?:(?:0|[1-9]\d*)(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?")
+_BOOLS = {"true": True, "false": False}
+
+
+def infer_column_types(sample: Iterable[list[str]], column_count: int) -> list[ColumnType]:
+    """Infers the type of each column from a sample of rows.
+
+    Empty values are ignored (they are converted to nulls), and a column is only given a
+    type if all its (non-empty) sampled values are of that type - otherwise it is a string.
+    """
+    candidates = [{ColumnType.int, ColumnType.float, ColumnType.bool} for _ in range(column_count)]
+    seen_values = [False] * column_count
+    for row in sample:
+        for i, value in enumerate(row[:column_count]):
+            if not value:
+                continue
+            seen_values[i] = True
+            candidates[i] &= _value_types(value)
+
+    return [
+        _narrowest(column_candidates) if seen else ColumnType.string
+        for column_candidates, seen in zip(candidates, seen_values)
+    ]
+
+
+def _value_types(value: str) -> set[ColumnType]:
+    if _INT_RE.fullmatch(value):
+        return {ColumnType.int, ColumnType.float}
+    if _FLOAT_RE.fullmatch(value):
+        return {ColumnType.float}
+    if value.lower() in _BOOLS:
+        return {ColumnType.bool}
+    return set()
+
+
+def _narrowest(candidates: set[ColumnType]) -> ColumnType:
+    for column_type in (ColumnType.int, ColumnType.float, ColumnType.bool):
+        if column_type in candidates:
+            return column_type
+    return ColumnType.string
+
+
+def _to_int(value: str) -> int:
+    if not _INT_RE.fullmatch(value):
+        raise ValueError(value)
+    return int(value)
+
+
+def _to_float(value: str) -> float:
+    if not _FLOAT_RE.fullmatch(value):
+        raise ValueError(value)
+    return float(value)
+
+
+def _to_bool(value: str) -> bool:
+    return _BOOLS[value.lower()]
+
+
+_PARSERS = {
+    ColumnType.int: _to_int,
+    ColumnType.float: _to_float,
+    ColumnType.bool: _to_bool,
+}
+
+
+def value_converter(column_type: ColumnType) -> Callable[[str], object]:
+    """Returns a function converting CSV values to the given type.
+
+    Empty values become `None`, and values that cannot be converted (i.e. that did not
+    show up in the sample used to infer the type) are kept as strings.
+    """
+    if column_type == ColumnType.string:
+        return lambda value: value if value else None
+
+    parse = _PARSERS[column_type]
+
+    def convert(value: str):
+        if not value:
+            return None
+        try:
+            return parse(value)
+        except (ValueError, KeyError):
+            return value
+
+    return convert
+
+
+def row_converter(column_types: list[ColumnType]) -> Callable[[list[str]], list]:
+    """Returns a function converting a whole CSV row, using the type of each column"""
+    converters = [value_converter(column_type) for column_type in column_types]
+
+    def convert(row: list[str]) -> list:
+        return [converter(value) for converter, value in zip(converters, row)]
+
+    return convert
@@ -1,45 +1,206 @@
 import csv
+import io
 import json
+from itertools import chain, islice
+from multiprocessing import Pool
+from typing import Iterator
 
+from batch import chunk_offsets
+from converters.column_types import SAMPLE_SIZE, row_converter
+from converters.enums import OutputFormat
+from converters.schema import Schema, file_key, infer_schema, load_schema, save_schema
+from converters.writers import WRITERS
 
-def _validate_header_count(csv_file_name: str, expected_column_count: int):
-    with open(csv_file_name) as f:
-        reader = csv.reader(f)
-        row = next(reader)
-        if len(row) != expected_column_count:
-            raise ValueError("Header count and actual CSV file column mismatch.")
+try:
+    import orjson
+except ImportError:  # orjson is optional, it is only used to speed things up
+    orjson = None
 
+CHUNK_SIZE = 16 * 1024 * 1024  # bytes of CSV encoded by each worker task
+WRITE_BUFFER_SIZE = 1024 * 1024
 
-def convert_csv_to_json(
+
+def _read_headers(
+    csv_data: Iterator[list[str]], has_headers: bool, custom_headers: list[str] = None
+) -> tuple[list[str], Iterator[list[str]]]:
+    """Reads the header row, if any, and validates the custom headers (if specified).
+
+    Returns the headers, and an iterator of the remaining (data) rows.
+    """
+    first_row = next(csv_data, None)
+    if first_row is None:
+        raise ValueError("CSV file is empty.")
+
+    # Validate custom_headers count against the first row of the file (if specified)
+    if custom_headers and len(first_row) != len(custom_headers):
+        raise ValueError("Header count and actual CSV file column mismatch.")
+
+    if has_headers:
+        return list(custom_headers or first_row), csv_data
+    return list(custom_headers), chain([first_row], csv_data)
+
+
+def _load_or_infer_schema(
+    csv_file_name: str, key: dict, column_count: int, rows: Iterator[list[str]]
+) -> tuple[Schema, Iterator[list[str]]]:
+    """Returns the schema cached next to the CSV file, inferring (and caching) it if needed.
+
+    Rows are only sampled when the schema has to be inferred - the returned iterator
+    still includes those sampled rows.
+    """
+    schema = load_schema(csv_file_name, key, column_count)
+    if schema is not None:
+        return schema, rows
+
+    sample = list(islice(rows, SAMPLE_SIZE))
+    schema = infer_schema(sample, column_count)
+    save_schema(csv_file_name, key, schema)
+    return schema, chain(sample, rows)
+
+
+def convert_csv(
     csv_file_name: str,
     out_file_name: str,
     has_headers: bool = False,
     custom_headers: list[str] = None,
+    output_format: OutputFormat = OutputFormat.json,
+    infer_types: bool = False,
 ):
+    """Converts a CSV file to one of the `OutputFormat` formats.
+
+    With `infer_types`, the type of each column (int, float, bool or string) is inferred
+    from a sample of rows, and values are converted to that type (empty values become
+    nulls) - otherwise every value is written as a string.
+    """
     # If has_headers is False, then custom_headers *must* be provided
     if not has_headers and not custom_headers:
         raise ValueError("Headers must be provided if CSV does not contain them.")
 
-    # Validate custom_headers count (if specified)
-    if custom_headers:
-        _validate_header_count(csv_file_name, len(custom_headers))
-
     # Instead of reading the entire CSV file into memory, we'll read
-    # it in row by row, and output the JSON as the same time - more memory efficient
-    with open(csv_file_name) as in_file:
-        with open(out_file_name, "w") as out_file:
-            csv_data = csv.reader(in_file)
-
-            file_headers = next(csv_data) if has_headers else None
-            csv_headers = custom_headers or file_headers
-
-            out_file.write("[")
-            first_element = True
-            for row in csv_data:
-                if first_element:
-                    first_element = False
-                else:
-                    out_file.write(",")
-                output_dict = dict(zip(csv_headers, row))
-                out_file.write(json.dumps(output_dict, indent=0))
-            out_file.write("]")
+    # it in row by row, and output the rows as the same time - more memory efficient
+    with open(csv_file_name, "rb") as raw_file:
+        key = file_key(raw_file, has_headers) if infer_types else None
+        csv_data = csv.reader(io.TextIOWrapper(raw_file))
+        csv_headers, rows = _read_headers(csv_data, has_headers, custom_headers)
+
+        schema = None
+        if infer_types:
+            schema, rows = _load_or_infer_schema(csv_file_name, key, len(csv_headers), rows)
+            rows = map(row_converter(schema.column_types), rows)
+
+        write = WRITERS[output_format]
+        write(out_file_name, csv_headers, rows, schema)
+
+
+def convert_csv_to_json(
+    csv_file_name: str,
+    out_file_name: str,
+    has_headers: bool = False,
+    custom_headers: list[str] = None,
+):
+    convert_csv(
+        csv_file_name=csv_file_name,
+        out_file_name=out_file_name,
+        has_headers=has_headers,
+        custom_headers=custom_headers,
+    )
+
+
+def convert_csv_to_json_parallel(
+    csv_file_name: str,
+    out_file_name: str,
+    has_headers: bool = False,
+    custom_headers: list[str] = None,
+    workers: int = None,
+    chunk_size: int = CHUNK_SIZE,
+    encoding: str = "utf-8",
+    output_format: OutputFormat = OutputFormat.json,
+    infer_types: bool = False,
+):
+    """High-throughput version of `convert_csv_to_json`.
+
+    The input file is split into chunks of about `chunk_size` bytes, at line boundaries,
+    and the chunks are encoded to JSON by a pool of `workers` processes (one per CPU by
+    default), using `orjson` if it is installed. Encoded chunks are written out in order,
+    with large buffered writes. Only the `json` and `ndjson` output formats are supported.
+
+    The JSON is written compactly (no whitespace), and this assumes quoted values in the
+    CSV file do not contain line breaks, since chunks are split on line breaks.
+    """
+    if output_format not in _PARALLEL_LAYOUTS:
+        raise ValueError(f"Parallel conversion does not support {output_format.name} output.")
+
+    if not has_headers and not custom_headers:
+        raise ValueError("Headers must be provided if CSV does not contain them.")
+
+    with open(csv_file_name, "rb") as f:
+        key = file_key(f, has_headers) if infer_types else None
+        first_line = f.readline()
+        data_start = f.tell() if has_headers else 0
+        csv_headers, _ = _read_headers(
+            csv.reader([first_line.decode(encoding)]), has_headers, custom_headers
+        )
+
+        column_types = None
+        if infer_types:
+            f.seek(data_start)
+            rows = csv.reader(io.TextIOWrapper(f, encoding=encoding, newline=""))
+            schema, _ = _load_or_infer_schema(csv_file_name, key, len(csv_headers), rows)
+            column_types = schema.column_types
+
+    offsets = chunk_offsets(csv_file_name, data_start, chunk_size)
+    tasks = [
+        (csv_file_name, start, end, csv_headers, column_types, output_format, encoding)
+        for start, end in zip(offsets, offsets[1:])
+    ]
+
+    prefix, separator, suffix = _PARALLEL_LAYOUTS[output_format]
+    with Pool(workers) as pool, open(out_file_name, "wb", buffering=WRITE_BUFFER_SIZE) as out_file:
+        out_file.write(prefix)
+        is_empty = True
+        for encoded_chunk in pool.imap(_encode_chunk, tasks):
+            if not encoded_chunk:
+                continue
+            if not is_empty:
+                out_file.write(separator)
+            out_file.write(encoded_chunk)
+            is_empty = False
+        if output_format == OutputFormat.json or not is_empty:
+            out_file.write(suffix)
+
+
+# start of file, separator between rows, and end of file (ndjson files end with a line break,
+# unless they are empty)
+_PARALLEL_LAYOUTS = {
+    OutputFormat.json: (b"[", b",", b"]"),
+    OutputFormat.ndjson: (b"", b"\n", b"\n"),
+}
+
+
+def _encode_chunk(task: tuple) -> bytes:
+    file_name, start, end, headers, column_types, output_format, encoding = task
+    with open(file_name, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start).decode(encoding)
+
+    rows = csv.reader(io.StringIO(data, newline=""))
+    if column_types:
+        rows = map(row_converter(column_types), rows)
+
+    _, separator, _ = _PARALLEL_LAYOUTS[output_format]
+    try:
+        return separator.join(_encode_row(dict(zip(headers, row))) for row in rows)
+    except (TypeError, ValueError) as ex:
+        raise ValueError(f"Could not encode {file_name} as JSON: {ex}")
+
+
+_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+def _encode_row(row: dict) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(row)
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers that do not fit in 64 bits, which the json module encodes
+    return _ENCODER.encode(row).encode()
@@ -0,0 +1,16 @@
+from enum import Enum
+
+
+class OutputFormat(Enum):
+    json = "json"  # a single JSON array of objects
+    ndjson = "ndjson"  # one JSON object per line (a.k.a. JSON lines)
+    columns = "columns"  # a single JSON object, with an array of values for each column
+    parquet = "parquet"  # requires pyarrow
+    arrow = "arrow"  # Arrow IPC file, requires pyarrow
+
+
+class ColumnType(Enum):
+    string = "string"
+    int = "int"
+    float = "float"
+    bool = "bool"
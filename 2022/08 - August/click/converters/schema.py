@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import BinaryIO
+
+from converters.column_types import infer_column_types
+from converters.enums import ColumnType
+
+HASHED_BYTES = 1024 * 1024  # bytes at the start of the file hashed to identify it
+SCHEMA_SUFFIX = ".schema.json"
+
+
+@dataclass
+class ColumnSchema:
+    type: ColumnType
+    nullable: bool
+
+
+@dataclass
+class Schema:
+    columns: list[ColumnSchema]
+
+    @property
+    def column_types(self) -> list[ColumnType]:
+        return [column.type for column in self.columns]
+
+    def to_dict(self) -> dict:
+        return {
+            "columns": [{**asdict(column), "type": column.type.value} for column in self.columns]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Schema":
+        return cls(
+            columns=[
+                ColumnSchema(type=ColumnType(column["type"]), nullable=column["nullable"])
+                for column in data["columns"]
+            ]
+        )
+
+
+def infer_schema(sample: list[list[str]], column_count: int) -> Schema:
+    """Infers the type and nullability of each column from a sample of rows"""
+    column_types = infer_column_types(sample, column_count)
+    nullable = [False] * column_count
+    for row in sample:
+        padded_row = row[:column_count] + [""] * (column_count - len(row))
+        for i, value in enumerate(padded_row):
+            if not value:
+                nullable[i] = True
+    return Schema(
+        columns=[
+            ColumnSchema(type=column_type, nullable=is_nullable)
+            for column_type, is_nullable in zip(column_types, nullable)
+        ]
+    )
+
+
+def file_key(f: BinaryIO, has_headers: bool) -> dict:
+    """Identifies the content of an (open) CSV file, to know when a cached schema is stale.
+
+    Uses the size and modification time of the file, along with a hash of its first
+    bytes, and leaves the file positioned at its start.
+    """
+    stat = os.fstat(f.fileno())
+    f.seek(0)
+    digest = hashlib.sha256(f.read(HASHED_BYTES)).hexdigest()
+    f.seek(0)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest,
+        "has_headers": has_headers,
+    }
+
+
+def schema_file_name(csv_file_name: str) -> str:
+    return f"{csv_file_name}{SCHEMA_SUFFIX}"
+
+
+def load_schema(csv_file_name: str, key: dict, column_count: int) -> Schema | None:
+    """Loads the schema cached next to a CSV file - if it is still valid for that file"""
+    try:
+        with open(schema_file_name(csv_file_name)) as f:
+            cached = json.load(f)
+        schema = Schema.from_dict(cached["schema"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    if cached.get("key") != key or len(schema.columns) != column_count:
+        return None
+    return schema
+
+
+def save_schema(csv_file_name: str, key: dict, schema: Schema):
+    """Caches a schema next to its CSV file (silently skipped if that is not possible)"""
+    try:
+        with open(schema_file_name(csv_file_name), "w") as f:
+            json.dump({"key": key, "schema": schema.to_dict()}, f, indent=2)
+    except OSError:
+        pass
@@ -0,0 +1,157 @@
+import json
+import tempfile
+from itertools import islice
+from typing import Iterable
+
+from converters.enums import ColumnType, OutputFormat
+from converters.schema import ColumnSchema, Schema
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pyarrow is optional, it is only needed for parquet and arrow output
+    pyarrow = None
+
+BATCH_SIZE = 64 * 1024  # rows per record batch, for parquet and arrow output
+
+
+def write_json(out_file_name: str, headers: list[str], rows: Iterable[list], schema=None):
+    """Writes rows as a single JSON array of objects"""
+    with open(out_file_name, "w") as out_file:
+        out_file.write("[")
+        first_element = True
+        for row in rows:
+            if first_element:
+                first_element = False
+            else:
+                out_file.write(",")
+            output_dict = dict(zip(headers, row))
+            out_file.write(json.dumps(output_dict, indent=0))
+        out_file.write("]")
+
+
+def write_ndjson(out_file_name: str, headers: list[str], rows: Iterable[list], schema=None):
+    """Writes rows as JSON lines - one JSON object per line"""
+    with open(out_file_name, "w") as out_file:
+        for row in rows:
+            out_file.write(json.dumps(dict(zip(headers, row))))
+            out_file.write("\n")
+
+
+def write_columns(out_file_name: str, headers: list[str], rows: Iterable[list], schema=None):
+    """Writes rows as a single JSON object, with an array of values for each column.
+
+    Values are spooled to a temporary file per column while the rows are read, and
+    the column files are then copied into the output one after the other, so rows
+    are never all held in memory.
+    """
+    column_files = [tempfile.TemporaryFile("w+") for _ in headers]
+    try:
+        for row_number, row in enumerate(rows):
+            separator = "," if row_number else ""
+            for column_file, value in zip(column_files, _pad_row(row, len(headers))):
+                column_file.write(separator + json.dumps(value))
+
+        with open(out_file_name, "w") as out_file:
+            out_file.write("{")
+            for i, (header, column_file) in enumerate(zip(headers, column_files)):
+                out_file.write(f"{',' if i else ''}{json.dumps(header)}:[")
+                column_file.seek(0)
+                while chunk := column_file.read(1024 * 1024):
+                    out_file.write(chunk)
+                out_file.write("]")
+            out_file.write("}")
+    finally:
+        for column_file in column_files:
+            column_file.close()
+
+
+_ARROW_TYPES = {
+    ColumnType.string: "string",
+    ColumnType.int: "int64",
+    ColumnType.float: "float64",
+    ColumnType.bool: "bool_",
+}
+
+
+def _arrow_schema(headers: list[str], schema: Schema | None):
+    # without a schema, every value is a string (and rows may be short of values)
+    columns = schema.columns if schema else [ColumnSchema(ColumnType.string, True)] * len(headers)
+    return pyarrow.schema(
+        [
+            pyarrow.field(
+                header, getattr(pyarrow, _ARROW_TYPES[column.type])(), nullable=column.nullable
+            )
+            for header, column in zip(headers, columns)
+        ]
+    )
+
+
+def _record_batches(arrow_schema, rows: Iterable[list]):
+    iterator = iter(rows)
+    column_count = len(arrow_schema.names)
+    while batch := list(islice(iterator, BATCH_SIZE)):
+        columns = list(zip(*(_pad_row(row, column_count) for row in batch)))
+        try:
+            arrays = [
+                pyarrow.array(column, type=field.type)
+                for column, field in zip(columns, arrow_schema)
+            ]
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError) as ex:
+            raise ValueError(
+                f"Values do not match the inferred column types ({ex}) - "
+                "convert without type inference instead."
+            ) from ex
+        for array, field in zip(arrays, arrow_schema):
+            if array.null_count and not field.nullable:
+                raise ValueError(
+                    f"Column '{field.name}' has empty values, which the rows sampled to "
+                    "infer its type did not - convert without type inference instead."
+                )
+        yield pyarrow.record_batch(arrays, schema=arrow_schema)
+
+
+def _require_pyarrow(output_format: OutputFormat):
+    if pyarrow is None:
+        raise RuntimeError(f"{output_format.name} output requires pyarrow: pip install pyarrow")
+
+
+def write_parquet(out_file_name: str, headers: list[str], rows: Iterable[list], schema=None):
+    """Writes rows to a Parquet file, one row group per batch of rows"""
+    _require_pyarrow(OutputFormat.parquet)
+    arrow_schema = _arrow_schema(headers, schema)
+    with pyarrow.parquet.ParquetWriter(out_file_name, arrow_schema) as writer:
+        for batch in _record_batches(arrow_schema, rows):
+            writer.write_batch(batch)
+
+
+def write_arrow(out_file_name: str, headers: list[str], rows: Iterable[list], schema=None):
+    """Writes rows to an Arrow IPC file, one record batch per batch of rows"""
+    _require_pyarrow(OutputFormat.arrow)
+    arrow_schema = _arrow_schema(headers, schema)
+    with pyarrow.ipc.new_file(out_file_name, arrow_schema) as writer:
+        for batch in _record_batches(arrow_schema, rows):
+            writer.write_batch(batch)
+
+
+def _pad_row(row: list, column_count: int) -> list:
+    return (list(row) + [None] * column_count)[:column_count]
+
+
+WRITERS = {
+    OutputFormat.json: write_json,
+    OutputFormat.ndjson: write_ndjson,
+    OutputFormat.columns: write_columns,
+    OutputFormat.parquet: write_parquet,
+    OutputFormat.arrow: write_arrow,
+}
+
+# file extension of each output format, used to name the output files in batch mode
+EXTENSIONS = {
+    OutputFormat.json: ".json",
+    OutputFormat.ndjson: ".ndjson",
+    OutputFormat.columns: ".json",
+    OutputFormat.parquet: ".parquet",
+    OutputFormat.arrow: ".arrow",
+}
@@ -0,0 +1,59 @@
+import importlib
+import sys
+import time
+
+import click
+
+
+class LazyGroup(click.Group):
+    """A command group whose subcommands are only imported when they are invoked.
+
+    `lazy_commands` maps each command name to an `(import_path, short_help)` tuple, where
+    `import_path` is of the form `"module:attribute"`. The short help is what `--help` shows
+    for the command, so listing the commands does not import them either.
+    """
+
+    def __init__(self, *args, lazy_commands: dict[str, tuple[str, str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+        self.import_times = {}  # command name -> (seconds, number of modules imported)
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            self.add_command(self._load_command(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter):
+        commands = []
+        for cmd_name in self.list_commands(ctx):
+            if cmd_name in self.commands:
+                cmd = self.commands[cmd_name]
+                if not cmd.hidden:
+                    commands.append((cmd_name, cmd.get_short_help_str))
+            else:
+                short_help = self.lazy_commands[cmd_name][1]
+                commands.append((cmd_name, lambda limit, help_=short_help: help_))
+
+        if commands:
+            limit = formatter.width - 6 - max(len(cmd_name) for cmd_name, _ in commands)
+            with formatter.section("Commands"):
+                formatter.write_dl([(cmd_name, get_help(limit)) for cmd_name, get_help in commands])
+
+    def _load_command(self, cmd_name: str) -> click.Command:
+        import_path, _ = self.lazy_commands[cmd_name]
+        module_name, attribute = import_path.split(":")
+
+        loaded_modules = len(sys.modules)
+        start = time.perf_counter()
+        command = getattr(importlib.import_module(module_name), attribute)
+        self.import_times[cmd_name] = (
+            time.perf_counter() - start,
+            len(sys.modules) - loaded_modules,
+        )
+
+        if not isinstance(command, click.Command):
+            raise TypeError(f"{import_path} is not a click command.")
+        return command
@@ -2,14 +2,37 @@ from datetime import datetime
 
 import click
 
-from converters.cli import converters_group
-from viewers import viewers_group
+from lazy_group import LazyGroup
+
+# command groups are only imported when they are invoked, so that commands such as `date`
+# do not pay for importing the dependencies of the other commands (tabulate, pyarrow, ...)
+LAZY_COMMANDS = {
+    "converters": ("converters.cli:converters_group", "Converter commands."),
+    "viewers": ("viewers:viewers_group", "CLI commands for viewing CSV and JSON files"),
+    "stats": ("stats.cli:stats_group", "Summary statistics commands."),
+}
 
 
 # first create a command group - this will be the top level CLI
-@click.group
-def main_cli():
-    pass
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS)
+@click.option(
+    "--profile-startup",
+    is_flag=True,
+    default=False,
+    help="Report the time spent importing the invoked command (use python -X importtime for "
+    "a breakdown by module)",
+)
+@click.pass_context
+def main_cli(ctx, profile_startup):
+    if profile_startup:
+        # by the time the group runs, the invoked subcommand has already been imported
+        if not ctx.command.import_times:
+            click.echo(f"{ctx.invoked_subcommand}: nothing to import", err=True)
+        for cmd_name, (seconds, module_count) in ctx.command.import_times.items():
+            click.echo(
+                f"{cmd_name}: imported in {seconds * 1000:.1f} ms ({module_count} modules)",
+                err=True,
+            )
 
 
 @click.command
@@ -63,11 +86,6 @@ main_cli.add_command(date)
 main_cli.add_command(time)
 main_cli.add_command(view_click_docs)
 
-# add command groups to CLI root
-main_cli.add_command(viewers_group)
-main_cli.add_command(converters_group)
-
-
 # if you do not use setuptools, you'll need to uncomment this code,
 # and invoke the CLI as explained in the README (better yet, check out the video in my YouTube
 # channel - https://www.youtube.com/channel/UCOsGw17tMhM4-GBjvQnXGzQ
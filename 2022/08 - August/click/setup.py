@@ -3,7 +3,7 @@ from setuptools import setup
 setup(
     name="my-super-duper-cli",
     version="0.1.0",
-    py_modules=["main"],
-    install_requires=["click", "tabulate"],
+    py_modules=["main", "lazy_group", "batch"],
+    install_requires=["click", "tabulate>=0.10"],
     entry_points={"console_scripts": ["cli = main:main_cli"]},
 )
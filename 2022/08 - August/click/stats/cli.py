@@ -0,0 +1,93 @@
+import click
+from tabulate import tabulate
+
+from stats.csv_stats import TOP_K, csv_stats
+
+
+@click.group(name="stats")
+def stats_group():
+    """Summary statistics commands."""
+
+
+@click.command(name="csv")
+@click.argument("file_name", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--has-header",
+    "has_headers",
+    is_flag=True,
+    default=False,
+    help="Specify this flag is the CSV file has a header row",
+)
+@click.option(
+    "--group-by",
+    "-g",
+    default=None,
+    type=str,
+    help="Compute statistics for each value of this column (a column position, starting "
+    "from 1, if the file has no header row)",
+)
+@click.option(
+    "--top",
+    "-k",
+    "top_k",
+    default=TOP_K,
+    type=click.IntRange(0),
+    help="Number of most frequent values to display for each column",
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=None,
+    type=click.IntRange(1),
+    help="Number of worker processes summarizing chunks of the file (one per CPU by default)",
+)
+def csv_stats_command(file_name, has_headers, group_by, top_k, workers):
+    """Display summary statistics for each column of a CSV file
+
+    Count, null (empty) count, min, max, mean, distinct count and most frequent values are
+    computed in a single pass over the file, in parallel chunks. Distinct counts are
+    estimates (HyperLogLog). Counts of the most frequent values are exact, unless a column
+    has many distinct values: counts shown as ">=n" are then lower bounds.
+    """
+    try:
+        columns, groups = csv_stats(
+            file_name=file_name,
+            has_header_row=has_headers,
+            group_by=group_by,
+            top_k=top_k,
+            workers=workers,
+        )
+    except ValueError as ex:
+        raise click.ClickException(str(ex))
+
+    for i, (group, group_stats) in enumerate(groups.items()):
+        if group is not None:
+            click.echo(f"{'' if i == 0 else chr(10)}{group_by} = {group}")
+        rows = [
+            (
+                column,
+                column_stats.count,
+                column_stats.null_count,
+                column_stats.min,
+                column_stats.max,
+                None if column_stats.mean is None else f"{column_stats.mean:.6g}",
+                # the estimate can overshoot - there cannot be more distinct values than values
+                f"~{min(column_stats.distinct.count(), column_stats.count)}",
+                ", ".join(
+                    f"{value} ({n})" if not error else f"{value} (>={n - error})"
+                    for value, n, error in column_stats.top.most_common(top_k)
+                ),
+            )
+            for column, column_stats in zip(columns, group_stats)
+        ]
+        click.echo(
+            tabulate(
+                rows,
+                headers=("column", "count", "nulls", "min", "max", "mean", "distinct", "top"),
+                tablefmt="simple",
+                disable_numparse=True,
+            )
+        )
+
+
+stats_group.add_command(csv_stats_command)
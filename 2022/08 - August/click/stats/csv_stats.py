@@ -0,0 +1,170 @@
+import csv
+import io
+import math
+from collections import Counter, defaultdict
+from multiprocessing import Pool
+
+from batch import chunk_offsets
+from stats.sketches import HyperLogLog, TopK
+
+CHUNK_SIZE = 16 * 1024 * 1024  # bytes of CSV summarized by each worker task
+TOP_K = 5
+
+
+class ColumnStats:
+    """Summary statistics of the values of a column, computed in a single pass.
+
+    Empty values count as nulls. Min, max and mean are numeric if every (non-null) value
+    is a number, otherwise min and max compare values as strings, and there is no mean.
+    Statistics computed over different rows (e.g. in different processes) can be combined
+    with `merge`.
+    """
+
+    def __init__(self, top_k: int = TOP_K):
+        self.count = 0
+        self.null_count = 0
+        self.is_numeric = True
+        self.total = 0.0
+        self.numeric_min = self.numeric_max = None  # (number, value as found in the file)
+        self.text_min = self.text_max = None
+        self.distinct = HyperLogLog()
+        self.top = TopK(capacity=max(100, 10 * top_k))
+
+    def update(self, values: list[str]):
+        """Adds a batch of values - working on whole batches keeps most of the work in C"""
+        counts = Counter(values)
+        self.null_count += counts.pop("", 0)
+        if not counts:
+            return
+
+        self.count += counts.total()
+        self.text_min = min(filter(None, (self.text_min, min(counts))))
+        self.text_max = max(filter(None, (self.text_max, max(counts))))
+        if self.is_numeric:
+            self._update_numbers(counts)
+        self.distinct.update(counts)
+        self.top.update(counts)
+
+    def _update_numbers(self, counts: Counter):
+        try:
+            numbers = {value: float(value) for value in counts}
+        except ValueError:
+            # no need to parse any more values, this is not a numeric column
+            self.is_numeric = False
+            return
+        self.total += math.fsum(number * counts[value] for value, number in numbers.items())
+        lowest = min(numbers.items(), key=lambda item: item[1])
+        highest = max(numbers.items(), key=lambda item: item[1])
+        self.numeric_min = min(filter(None, (self.numeric_min, lowest[::-1])))
+        self.numeric_max = max(filter(None, (self.numeric_max, highest[::-1])))
+
+    def merge(self, other: "ColumnStats"):
+        self.count += other.count
+        self.null_count += other.null_count
+        self.is_numeric = self.is_numeric and other.is_numeric
+        self.total += other.total
+        self.numeric_min = min(filter(None, (self.numeric_min, other.numeric_min)), default=None)
+        self.numeric_max = max(filter(None, (self.numeric_max, other.numeric_max)), default=None)
+        self.text_min = min(filter(None, (self.text_min, other.text_min)), default=None)
+        self.text_max = max(filter(None, (self.text_max, other.text_max)), default=None)
+        self.distinct.merge(other.distinct)
+        self.top.merge(other.top)
+
+    @property
+    def min(self) -> str | None:
+        if self.is_numeric:
+            return self.numeric_min and self.numeric_min[1]
+        return self.text_min
+
+    @property
+    def max(self) -> str | None:
+        if self.is_numeric:
+            return self.numeric_max and self.numeric_max[1]
+        return self.text_max
+
+    @property
+    def mean(self) -> float | None:
+        if self.is_numeric and self.count:
+            return self.total / self.count
+        return None
+
+
+def csv_stats(
+    file_name: str,
+    has_header_row: bool = False,
+    group_by: str = None,
+    top_k: int = TOP_K,
+    workers: int = None,
+    chunk_size: int = CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> tuple[list[str], dict[str | None, list[ColumnStats]]]:
+    """Computes summary statistics for each column of a CSV file, in a single pass.
+
+    The file is split into chunks of about `chunk_size` bytes, at line boundaries, that are
+    summarized by a pool of `workers` processes (one per CPU by default), and the summaries
+    are then merged - so this assumes quoted values do not contain line breaks.
+
+    Returns the column names (column positions, starting from 1, for files without a header
+    row), and the statistics of each column, for each value of the `group_by` column (or
+    under a `None` key, without `group_by`).
+    """
+    with open(file_name, "rb") as f:
+        first_line = f.readline()
+        data_start = f.tell() if has_header_row else 0
+    first_row = next(csv.reader([first_line.decode(encoding)]), [])
+    if has_header_row:
+        columns = first_row
+    else:
+        columns = [str(position) for position in range(1, len(first_row) + 1)]
+
+    if group_by is None:
+        group_column = None
+    elif group_by in columns:
+        group_column = columns.index(group_by)
+    else:
+        raise ValueError(f"Unknown group by column '{group_by}'.")
+
+    offsets = chunk_offsets(file_name, data_start, chunk_size)
+    tasks = [
+        (file_name, start, end, len(columns), group_column, top_k, encoding)
+        for start, end in zip(offsets, offsets[1:])
+    ]
+    if workers == 1 or len(tasks) <= 1:
+        chunk_results = map(_chunk_stats, tasks)
+        return columns, _merge_groups(chunk_results)
+    with Pool(workers) as pool:
+        return columns, _merge_groups(pool.imap_unordered(_chunk_stats, tasks))
+
+
+def _chunk_stats(task: tuple) -> dict[str | None, list[ColumnStats]]:
+    file_name, start, end, column_count, group_column, top_k, encoding = task
+    with open(file_name, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start).decode(encoding)
+
+    grouped_rows = defaultdict(list)
+    for row in csv.reader(io.StringIO(data, newline="")):
+        if not row:
+            continue
+        if len(row) != column_count:
+            row = (row + [""] * column_count)[:column_count]
+        grouped_rows[row[group_column] if group_column is not None else None].append(row)
+
+    groups = {}
+    for group, rows in grouped_rows.items():
+        groups[group] = [ColumnStats(top_k) for _ in range(column_count)]
+        for column_stats, values in zip(groups[group], zip(*rows)):
+            column_stats.update(values)
+    return groups
+
+
+def _merge_groups(chunk_results) -> dict[str | None, list[ColumnStats]]:
+    merged = {}
+    for groups in chunk_results:
+        for group, group_stats in groups.items():
+            if group not in merged:
+                merged[group] = group_stats
+                continue
+            for column_stats, other in zip(merged[group], group_stats):
+                column_stats.merge(other)
+    return dict(sorted(merged.items(), key=lambda item: item[0] or ""))
@@ -0,0 +1,97 @@
+import heapq
+import math
+from collections import Counter
+from hashlib import blake2b
+from typing import Iterable
+
+
+class HyperLogLog:
+    """Estimates the number of distinct values seen, in a fixed amount of memory.
+
+    Uses `2 ** precision` one byte registers, for a typical error of `1.04 / sqrt(2 ** precision)`
+    (about 1.6% with the default precision). Values are hashed with blake2b, rather than
+    `hash()`, so that sketches built in different processes can be merged.
+    """
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def update(self, values: Iterable[str]):
+        registers = self.registers
+        remaining_bits = 64 - self.precision
+        mask = (1 << remaining_bits) - 1
+        for value in values:
+            hashed = int.from_bytes(blake2b(value.encode(), digest_size=8).digest(), "big")
+            index = hashed >> remaining_bits
+            # position of the first 1 bit in the remaining bits
+            rank = remaining_bits - (hashed & mask).bit_length() + 1
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def merge(self, other: "HyperLogLog"):
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0**-register for register in self.registers)
+        empty_registers = self.registers.count(0)
+        if estimate <= 2.5 * m and empty_registers:
+            # small cardinalities are better estimated by counting the empty registers
+            estimate = m * math.log(m / empty_registers)
+        return round(estimate)
+
+
+class TopK:
+    """Keeps track of the most frequent values seen, in a bounded amount of memory.
+
+    This is a (mergeable) Space-Saving summary, with at most `capacity` counters. Counts are
+    exact as long as there are no more than `capacity` distinct values. Otherwise, a value
+    that was not tracked from the start is counted as if it had been seen as often as the
+    values it replaced: its count may overshoot, by at most its error, and the count minus
+    the error is a lower bound. Values that are not tracked were seen at most `floor` times.
+    """
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self.counts = Counter()
+        self.errors = {}
+        # the most times any value that is not tracked may have been seen
+        self.floor = 0
+
+    def update(self, counts: Counter):
+        """Adds values, given as a Counter of the number of times each value was seen"""
+        self._combine(counts, {}, 0)
+
+    def merge(self, other: "TopK"):
+        self._combine(other.counts, other.errors, other.floor)
+
+    def _combine(self, counts: Counter, errors: dict[str, int], floor: int):
+        # a value missing from either side may have been seen up to that side's floor
+        combined = Counter()
+        combined_errors = {}
+        for value in self.counts.keys() | counts.keys():
+            combined[value] = self.counts.get(value, self.floor) + counts.get(value, floor)
+            combined_errors[value] = self.errors.get(value, self.floor) + errors.get(value, floor)
+        self.floor += floor
+
+        if len(combined) > self.capacity:
+            kept = heapq.nsmallest(self.capacity + 1, combined.items(), key=_by_count)
+            self.floor = max(self.floor, kept.pop()[1])
+            combined = Counter(dict(kept))
+        self.counts = combined
+        self.errors = {value: combined_errors[value] for value in combined}
+
+    def most_common(self, k: int) -> list[tuple[str, int, int]]:
+        """The `k` values with the highest counts, as `(value, count, error)` tuples - the
+        count is exact if the error is 0, otherwise the value was seen at least
+        `count - error` times (and at most `count` times)"""
+        top = heapq.nsmallest(k, self.counts.items(), key=_by_count)
+        return [(value, n, self.errors[value]) for value, n in top]
+
+
+def _by_count(item: tuple[str, int]) -> tuple[int, str]:
+    # highest counts first, and values with the same count in order, so output is repeatable
+    value, n = item
+    return -n, value
@@ -0,0 +1,23 @@
+import pytest
+
+from converters.column_types import infer_column_types, value_converter
+from converters.enums import ColumnType
+
+
+@pytest.mark.parametrize(
+    "values, column_type",
+    [
+        (["0", "-12", "+3"], ColumnType.int),
+        (["0.5", "1e3", "-.25", "0"], ColumnType.float),
+        (["02134", "1"], ColumnType.string),
+        (["007.5", "1.5"], ColumnType.string),
+        (["true", "False"], ColumnType.bool),
+    ],
+)
+def test_infer_column_types(values, column_type):
+    assert infer_column_types([[value] for value in values], 1) == [column_type]
+
+
+def test_leading_zeros_are_kept():
+    assert value_converter(ColumnType.int)("02134") == "02134"
+    assert value_converter(ColumnType.float)("01.5") == "01.5"
@@ -0,0 +1,59 @@
+import io
+import json
+
+import pytest
+
+from viewers.json_viewer import iter_events, stream_json
+
+VALID = [
+    '{"a": 1, "b": [true, false, null], "c": {"d": "e"}}',
+    "[]",
+    "{}",
+    '[[], {}, [1, [2, {"x": []}]]]',
+    '"text"',
+    "-1.5",
+]
+
+INVALID = [
+    "[1 2]",
+    '{"a" 1}',
+    '{"a":}',
+    "[,]",
+    "[1,2",
+    '{"a": 1,}',
+    "[1,]",
+    "}",
+    '{"a"}',
+    '{"a": 1 "b": 2}',
+    "{1: 2}",
+    "[1}",
+    '{"a": [1, 2}',
+    '{"a": 1',
+    '{"a"',
+    "[",
+]
+
+
+@pytest.mark.parametrize("text", VALID)
+def test_stream_json_matches_json_dumps(text, tmp_path):
+    file_name = tmp_path / "data.json"
+    file_name.write_text(text)
+    expected = json.dumps(json.loads(text), indent=2).splitlines()
+    assert list(stream_json(str(file_name), indent=2)) == expected
+
+
+def test_stream_json_lines(tmp_path):
+    documents = ['{"a": 1}', "[1, 2]", '"x"']
+    file_name = tmp_path / "data.jsonl"
+    file_name.write_text("\n".join(documents))
+    expected = [
+        json.dumps(json.loads(document), indent=0).replace("\n", "") for document in documents
+    ]
+    assert list(stream_json(str(file_name), indent=0)) == expected
+
+
+@pytest.mark.parametrize("text", INVALID)
+@pytest.mark.parametrize("chunk_size", [1, 64 * 1024])
+def test_iter_events_rejects_invalid_json(text, chunk_size):
+    with pytest.raises(ValueError, match="Invalid JSON"):
+        list(iter_events(io.StringIO(text), chunk_size))
@@ -0,0 +1,65 @@
+import random
+from collections import Counter
+
+from batch import chunk_offsets
+from stats.csv_stats import csv_stats
+from stats.sketches import TopK
+
+
+def skewed_values(count: int, seed: int = 0) -> list[str]:
+    # a few frequent values, among many values seen once or twice
+    rng = random.Random(seed)
+    return [
+        f"hot{rng.randrange(5)}" if rng.random() < 0.3 else f"cold{rng.randrange(count)}"
+        for _ in range(count)
+    ]
+
+
+def test_counts_are_exact_under_capacity():
+    top = TopK(capacity=10)
+    top.update(Counter("abracadabra"))
+    top.merge(TopK(capacity=10))
+    assert top.most_common(3) == [("a", 5, 0), ("b", 2, 0), ("r", 2, 0)]
+
+
+def test_high_cardinality_values_are_still_reported():
+    top = TopK(capacity=5)
+    for i in range(0, 100, 10):
+        top.update(Counter(str(value) for value in range(i, i + 10)))
+    assert len(top.most_common(3)) == 3
+
+
+def test_merged_counts_bound_the_true_counts():
+    values = skewed_values(20_000)
+    exact = Counter(values)
+    top = TopK(capacity=20)
+    for i in range(0, len(values), 1_000):
+        chunk = TopK(capacity=20)
+        chunk.update(Counter(values[i : i + 1_000]))
+        top.merge(chunk)
+
+    most_common = top.most_common(5)
+    assert {value for value, _, _ in most_common} == {f"hot{i}" for i in range(5)}
+    for value, n, error in most_common:
+        assert n - error <= exact[value] <= n
+    assert all(n <= top.floor for value, n in exact.items() if value not in top.counts)
+
+
+def test_chunk_offsets_end_at_line_breaks(tmp_path):
+    file_name = tmp_path / "data.csv"
+    file_name.write_bytes(b"".join(f"{i},{'x' * i}\n".encode() for i in range(100)))
+    offsets = chunk_offsets(str(file_name), 0, 100)
+    data = file_name.read_bytes()
+    assert offsets[0] == 0 and offsets[-1] == len(data)
+    assert all(data[offset - 1 : offset] == b"\n" for offset in offsets[1:])
+
+
+def test_csv_stats_in_chunks(tmp_path):
+    values = skewed_values(5_000, seed=1)
+    file_name = tmp_path / "data.csv"
+    file_name.write_text("value\n" + "".join(f"{value}\n" for value in values))
+    columns, groups = csv_stats(str(file_name), has_header_row=True, workers=1, chunk_size=1_000)
+    (column_stats,) = groups[None]
+    assert columns == ["value"] and column_stats.count == len(values)
+    expected = [value for value, _ in Counter(values).most_common(5)]
+    assert sorted(value for value, _, _ in column_stats.top.most_common(5)) == sorted(expected)
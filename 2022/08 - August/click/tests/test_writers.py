@@ -0,0 +1,24 @@
+import pytest
+
+from converters.enums import ColumnType
+from converters.schema import infer_schema
+from converters.writers import write_parquet
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def test_parquet_fields_use_inferred_nullability(tmp_path):
+    sample = [["1", "x"], ["2", ""]]
+    schema = infer_schema(sample, 2)
+    out_file_name = str(tmp_path / "out.parquet")
+    write_parquet(out_file_name, ["a", "b"], [[1, "x"], [2, None]], schema)
+
+    fields = pq.read_schema(out_file_name)
+    assert [column.type for column in schema.columns] == [ColumnType.int, ColumnType.string]
+    assert [fields.field(name).nullable for name in ("a", "b")] == [False, True]
+
+
+def test_parquet_rejects_nulls_in_non_nullable_columns(tmp_path):
+    schema = infer_schema([["1"], ["2"]], 1)
+    with pytest.raises(ValueError, match="empty values"):
+        write_parquet(str(tmp_path / "out.parquet"), ["a"], [[1], [None]], schema)
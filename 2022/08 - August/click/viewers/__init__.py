@@ -1,8 +1,11 @@
+import os
+
 import click
 
-from viewers.csv_viewer import preview_csv
+from batch import expand_inputs, is_batch_input, run_batch
+from viewers.csv_viewer import render_csv, stream_csv
 from viewers.enums import TableFormat
-from viewers.json_viewer import preview_json
+from viewers.json_viewer import stream_json
 
 
 @click.group(name="viewers")
@@ -26,14 +29,30 @@ def viewers_group():
     type=click.IntRange(0),
     help="Specifies the indentation level for viewing the JSON object",
 )
-def view_json(file_name, numlines, indent):
-    """Use FILE_NAME to Specify a path to the JSON file you wish to preview"""
-    result = preview_json(file_name=file_name, first_n=numlines, indent=indent)
-    click.echo(result)
+@click.option(
+    "--select",
+    "-s",
+    default=None,
+    type=str,
+    help="JSONPath-like expression selecting the values to display, e.g. '$.results[*].name'",
+)
+def view_json(file_name, numlines, indent, select):
+    """Use FILE_NAME to Specify a path to the JSON file you wish to preview
+
+    The file is parsed incrementally, and only as far as needed to display the
+    requested lines. JSON lines files (one JSON document per line) are supported too.
+    """
+    try:
+        for line in stream_json(
+            file_name=file_name, first_n=numlines, indent=indent, select=select
+        ):
+            click.echo(line)
+    except ValueError as ex:
+        raise click.ClickException(str(ex))
 
 
 @click.command(name="csv")
-@click.argument("file_name", type=click.Path(exists=True, dir_okay=False))
+@click.argument("file_name", type=str)
 @click.option(
     "--has-header",
     "has_headers",
@@ -43,12 +62,34 @@ def view_json(file_name, numlines, indent):
 )
 @click.option(
     "--numlines",
+    "--rows",
     "-n",
     "line_count",
     default=None,
     type=click.IntRange(1),
     help="Number of rows to display (excluding header row, if any)",
 )
+@click.option(
+    "--offset",
+    default=0,
+    type=click.IntRange(0),
+    help="Number of the first row to display, from 0 (excluding header row, if any) - "
+    "uses an index of the file, stored next to it, to jump to that row",
+)
+@click.option(
+    "--where",
+    multiple=True,
+    type=str,
+    help="Only display rows where a column has a value, as column=value (use column positions "
+    "starting from 1, if the file has no header row) - can be repeated",
+)
+@click.option(
+    "--use-index",
+    is_flag=True,
+    default=False,
+    help="Look up the rows matching the first --where filter using an index of that column "
+    "(built the first time, and stored next to the file)",
+)
 @click.option(
     "--format",
     "-f",
@@ -57,13 +98,101 @@ def view_json(file_name, numlines, indent):
     type=click.Choice([e.name for e in TableFormat], case_sensitive=True),
     help="Specify the formatting style",
 )
-def view_csv(file_name, line_count, has_headers, format_):
-    """View CSV files"""
+@click.option(
+    "--tail",
+    is_flag=True,
+    default=False,
+    help="Display the last rows instead of the first ones (10 rows, unless --numlines is set)",
+)
+@click.option(
+    "--pager",
+    is_flag=True,
+    default=False,
+    help="Display the table in a pager, as it is being rendered",
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=None,
+    type=click.IntRange(1),
+    help="Number of files rendered at once, when viewing several files (one per CPU by default)",
+)
+def view_csv(
+    file_name, line_count, offset, where, use_index, has_headers, format_, tail, pager, workers
+):
+    """View CSV files
+
+    Rows are rendered a page at a time as the file is read, so even very large files
+    can be viewed without loading them in memory.
+
+    FILE_NAME can also be a directory (all its .csv files are shown) or a quoted glob
+    pattern such as 'data/*.csv': the files are then rendered across a pool of worker
+    processes, and shown one after the other.
+    """
     format_ = TableFormat[format_]
-    result = preview_csv(
-        file_name=file_name, first_n=line_count, has_header_row=has_headers, table_format=format_
+    if tail and (offset or where):
+        raise click.UsageError("--tail cannot be combined with --offset or --where.")
+
+    if is_batch_input(file_name):
+        tables = _render_batch(
+            file_names=expand_inputs(file_name),
+            line_count=line_count,
+            has_headers=has_headers,
+            format_=format_,
+            tail=tail,
+            offset=offset,
+            where=where,
+            use_index=use_index,
+            workers=workers,
+        )
+        if pager:
+            click.echo_via_pager(tables)
+        else:
+            for table in tables:
+                click.echo(table, nl=False)
+        return
+
+    if not os.path.isfile(file_name):
+        raise click.BadParameter(f"File '{file_name}' does not exist.", param_hint="FILE_NAME")
+    pages = stream_csv(
+        file_name=file_name,
+        first_n=line_count,
+        has_header_row=has_headers,
+        table_format=format_,
+        tail=tail,
+        offset=offset,
+        where=where,
+        use_index=use_index,
     )
-    click.echo(result)
+    try:
+        if pager:
+            click.echo_via_pager(f"{page}\n" for page in pages)
+        else:
+            for page in pages:
+                click.echo(page)
+    except ValueError as ex:
+        raise click.ClickException(str(ex))
+
+
+def _render_batch(
+    file_names, line_count, has_headers, format_, tail, offset, where, use_index, workers
+):
+    if not file_names:
+        raise click.ClickException("No CSV files match FILE_NAME.")
+
+    tasks = [
+        (file_name, line_count, has_headers, format_, tail, offset, where, use_index)
+        for file_name in file_names
+    ]
+    results = run_batch(render_csv, tasks, workers, ordered=True)
+    for i, (args, table, error, seconds) in enumerate(results, 1):
+        file_name = args[0]
+        # timing goes to stderr, so it does not end up in the pager (or redirected output)
+        click.echo(f"[{i}/{len(tasks)}] {file_name} ({seconds:.2f} s)", err=True)
+        if i > 1:
+            yield "\n"
+        yield f"==> {file_name} <==\n"
+        yield f"{table}\n" if error is None else f"Error: {error}\n"
 
 
 viewers_group.add_command(view_json)
@@ -0,0 +1,286 @@
+import csv
+import io
+import os
+import re
+import sqlite3
+from collections import deque
+from functools import lru_cache
+from typing import Iterator
+
+STRIDE = 1000  # the byte offset of every STRIDE-th row is stored in the index
+BLOCK_SIZE = 1024 * 1024  # bytes read at a time when building the index
+INDEX_SUFFIX = ".index.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value);
+CREATE TABLE IF NOT EXISTS line_offsets (row INTEGER PRIMARY KEY, offset INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS indexed_columns (column_number INTEGER PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS column_values (
+    column_number INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    PRIMARY KEY (column_number, value, offset)
+) WITHOUT ROWID;
+"""
+
+
+class CsvIndex:
+    """A sparse index of the rows of a CSV file, stored in a SQLite file next to it.
+
+    The byte offset of every `stride`-th row is stored, so any row can be reached by seeking
+    to the closest indexed row and skipping less than `stride` lines. Columns can also be
+    indexed, to find the rows holding a value without scanning the file.
+
+    The index is (re)built whenever the CSV file has changed since it was built. Rows are
+    numbered from 0, not counting the header row (if any), and, as for `--tail`, this assumes
+    that no quoted values contain line breaks.
+    """
+
+    def __init__(
+        self,
+        csv_file_name: str,
+        has_header_row: bool = False,
+        stride: int = STRIDE,
+        encoding: str = "utf-8",
+    ):
+        self.csv_file_name = csv_file_name
+        self.has_header_row = has_header_row
+        self.stride = stride
+        self.encoding = encoding
+        self._db = sqlite3.connect(index_file_name(csv_file_name))
+        # the index can always be rebuilt from the CSV file, so it is not worth syncing to disk
+        self._db.execute("PRAGMA synchronous = OFF")
+        self._db.executescript(_SCHEMA)
+        key = self._key()
+        meta = self._meta()
+        if {name: meta.get(name) for name in key} != key:
+            self._build()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._db.close()
+
+    @property
+    def row_count(self) -> int:
+        return self._meta()["row_count"]
+
+    def row_offset(self, row: int) -> int | None:
+        """The byte offset of a row, or None past the end of the file"""
+        if row >= self.row_count:
+            return None
+        indexed_row = row - row % self.stride
+        (offset,) = self._db.execute(
+            "SELECT offset FROM line_offsets WHERE row = ?", (indexed_row,)
+        ).fetchone()
+        if row == indexed_row:
+            return offset
+        with open(self.csv_file_name, "rb") as f:
+            f.seek(offset)
+            for _ in range(row - indexed_row):
+                f.readline()
+            return f.tell()
+
+    def rows(self, offset: int = 0) -> Iterator[list[str]]:
+        """Rows from row number `offset` onwards"""
+        start = self.row_offset(offset)
+        if start is None:
+            return
+        with open(self.csv_file_name, "rb") as f:
+            f.seek(start)
+            yield from csv.reader(io.TextIOWrapper(f, encoding=self.encoding, newline=""))
+
+    def find(self, column_number: int, value: str, offset: int = 0) -> Iterator[list[str]]:
+        """Rows from row number `offset` onwards holding `value` in a column, in file order.
+
+        The column is indexed first, if it is not already.
+        """
+        self.index_column(column_number)
+        start = self.row_offset(offset)
+        if start is None:
+            return
+        # rows are in the same order as their byte offsets
+        found = self._db.execute(
+            "SELECT offset FROM column_values "
+            "WHERE column_number = ? AND value = ? AND offset >= ? ORDER BY offset",
+            (column_number, value, start),
+        )
+        with open(self.csv_file_name, "rb") as f:
+            for (row_offset,) in found:
+                f.seek(row_offset)
+                yield next(csv.reader([f.readline().decode(self.encoding)]))
+
+    def index_column(self, column_number: int):
+        """Indexes the values of a column (numbered from 0), if it is not already"""
+        indexed = self._db.execute(
+            "SELECT 1 FROM indexed_columns WHERE column_number = ?", (column_number,)
+        ).fetchone()
+        if indexed:
+            return
+
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO column_values VALUES (?, ?, ?)",
+                (
+                    (column_number, row[column_number], row_offset)
+                    for row_offset, row in self._scan_rows()
+                    if column_number < len(row)
+                ),
+            )
+            self._db.execute("INSERT INTO indexed_columns VALUES (?)", (column_number,))
+
+    def _scan_rows(self) -> Iterator[tuple[int, list[str]]]:
+        """Yields the byte offset and values of every row"""
+        offsets = deque()
+
+        def lines(f):
+            offset = f.tell()
+            for line in f:
+                offsets.append(offset)
+                offset += len(line)
+                yield line.decode(self.encoding)
+
+        with open(self.csv_file_name, "rb") as f:
+            if self.has_header_row:
+                f.readline()
+            # a single reader parses all the lines (one row per line), which is much faster
+            # than parsing each line separately
+            for row in csv.reader(lines(f)):
+                yield offsets.popleft(), row
+
+    def _key(self) -> dict:
+        stat = os.stat(self.csv_file_name)
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "has_header_row": int(self.has_header_row),
+            "stride": self.stride,
+        }
+
+    def _meta(self) -> dict:
+        return dict(self._db.execute("SELECT name, value FROM meta"))
+
+    def _build(self):
+        key = self._key()
+        with open(self.csv_file_name, "rb") as f:
+            if self.has_header_row:
+                f.readline()
+            offsets, row_count = scan_line_offsets(f, self.stride)
+
+        with self._db:
+            for table in ("meta", "line_offsets", "indexed_columns", "column_values"):
+                self._db.execute(f"DELETE FROM {table}")
+            self._db.executemany(
+                "INSERT INTO line_offsets VALUES (?, ?)",
+                ((i * self.stride, offset) for i, offset in enumerate(offsets)),
+            )
+            self._db.executemany(
+                "INSERT INTO meta VALUES (?, ?)", [*key.items(), ("row_count", row_count)]
+            )
+
+
+def index_file_name(csv_file_name: str) -> str:
+    return f"{csv_file_name}{INDEX_SUFFIX}"
+
+
+@lru_cache
+def _lines_re(line_count: int) -> re.Pattern:
+    return re.compile(rb"(?:[^\n]*\n){%d}" % line_count)
+
+
+def scan_line_offsets(f, stride: int) -> tuple[list[int], int]:
+    """Scans a binary file from its current position, for the offset of every `stride`-th line.
+
+    Returns the offsets, and the number of lines. Lines are skipped `stride` at a time by a
+    regular expression, so the scan does not go through Python code for every line.
+    """
+    offsets = [f.tell()]
+    line_count = 0  # line breaks seen so far
+    block_offset = f.tell()
+    ends_with_line_break = True
+    while block := f.read(BLOCK_SIZE):
+        position = 0
+        while True:
+            # the number of line breaks up to the start of the next row to be indexed
+            needed = len(offsets) * stride - line_count
+            match = _lines_re(needed).match(block, position)
+            if not match:
+                line_count += block.count(b"\n", position)
+                break
+            position = match.end()
+            line_count += needed
+            offsets.append(block_offset + position)
+        block_offset += len(block)
+        ends_with_line_break = block.endswith(b"\n")
+
+    # the last line does not always end with a line break
+    row_count = line_count + (not ends_with_line_break)
+    return [offset for offset in offsets if offset < block_offset], row_count
+
+
+def parse_where(expression: str, headers: list[str] = None) -> tuple[int, str]:
+    """Parses a `column=value` filter into a column number (from 0) and a value.
+
+    The column is a header name or, for files without a header row, a column position
+    (starting from 1).
+    """
+    column, separator, value = expression.partition("=")
+    if not separator:
+        raise ValueError(f"Invalid filter '{expression}', expected column=value.")
+    if headers:
+        if column not in headers:
+            raise ValueError(f"Unknown column '{column}' in filter '{expression}'.")
+        return headers.index(column), value
+    if not column.isdigit() or int(column) < 1:
+        raise ValueError(
+            f"Invalid column '{column}' in filter '{expression}' - use column positions "
+            "(starting from 1) for files without a header row."
+        )
+    return int(column) - 1, value
+
+
+def select_rows(
+    file_name: str,
+    has_header_row: bool = False,
+    offset: int = 0,
+    where: list[str] = (),
+    use_index: bool = False,
+    headers: list[str] = None,
+) -> Iterator[list[str]]:
+    """Rows of a CSV file from row number `offset` onwards, matching all the `where` filters.
+
+    The sparse index is used (and built, if needed) to jump to `offset`. With `use_index`,
+    rows matching the first filter are looked up using a column index instead of being
+    scanned for.
+    """
+    conditions = [parse_where(expression, headers) for expression in where]
+    index = CsvIndex(file_name, has_header_row) if offset or use_index else None
+    try:
+        if index is None:
+            rows = _plain_rows(file_name, has_header_row)
+        elif use_index and conditions:
+            rows = index.find(*conditions[0], offset=offset)
+        else:
+            rows = index.rows(offset)
+
+        for row in rows:
+            if all(
+                column_number < len(row) and row[column_number] == value
+                for column_number, value in conditions
+            ):
+                yield row
+    finally:
+        if index is not None:
+            index.close()
+
+
+def _plain_rows(file_name: str, has_header_row: bool) -> Iterator[list[str]]:
+    with open(file_name, newline="") as f:
+        data = csv.reader(f)
+        if has_header_row:
+            next(data, None)
+        yield from data
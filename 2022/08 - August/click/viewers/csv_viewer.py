@@ -1,31 +1,219 @@
 import csv
-from itertools import islice
+import os
+from itertools import chain, islice
+from typing import Iterable, Iterator
 
 from tabulate import tabulate
 
+from viewers.csv_index import select_rows
 from viewers.enums import TableFormat
 
+SAMPLE_SIZE = 100  # rows used to estimate column widths when streaming
+PAGE_SIZE = 50  # rows rendered at a time when streaming
+TAIL_SIZE = 10  # rows shown by --tail when --numlines is not specified
+BLOCK_SIZE = 64 * 1024  # bytes read at a time when reading a file backwards
+# marks the first and last rows of each page, to find them in tables rendered by tabulate
+ROW_MARKER = "\u2400"
 
-def preview_csv(
+
+def stream_csv(
     file_name: str,
     first_n: int = None,
     has_header_row: bool = False,
     table_format: TableFormat = TableFormat.fancy_outline,
-) -> str:
-    with open(file_name) as f:
+    tail: bool = False,
+    page_size: int = PAGE_SIZE,
+    sample_size: int = SAMPLE_SIZE,
+    offset: int = 0,
+    where: list[str] = (),
+    use_index: bool = False,
+) -> Iterator[str]:
+    """Renders a CSV file as a single table, one page of rows at a time.
+
+    The file is never loaded in memory: column widths are estimated from the first
+    `sample_size` rows (longer values in later rows are truncated), so that every page
+    lines up with the previous ones, and rows are rendered as they are read. The first
+    chunk has the header (and top border) of the table, the last one its bottom border.
+
+    With `tail`, the last `first_n` rows are shown instead (read backwards from the end of
+    the file - this assumes no quoted values contain line breaks).
+
+    Otherwise, rows start at row number `offset` (from 0, not counting the header row), and
+    only rows matching all the `where` filters (`column=value`) are shown. A sparse index of
+    the file (see `CsvIndex`) is used to jump to `offset` without reading the rows before
+    it, and with `use_index`, a column index is used to find the rows matching the first
+    filter.
+    """
+    with open(file_name, newline="") as f:
         data = csv.reader(f)
+        headers = next(data, None) if has_header_row else None
 
-        if has_header_row:
-            headers = next(data)
+        if tail:
+            rows = iter(_tail_rows(file_name, first_n or TAIL_SIZE, has_header_row))
         else:
-            headers = None
+            if offset or where:
+                rows = select_rows(file_name, has_header_row, offset, where, use_index, headers)
+            else:
+                rows = data
+            if first_n:
+                rows = islice(rows, first_n)
 
-        if first_n:
-            rows = list(islice(data, first_n))
-        else:
-            rows = list(data)
+        sample = list(islice(rows, sample_size))
+        widths, numeric = _column_layout(headers, sample)
+        pages = _batched(chain(sample, rows), page_size)
+        yield from _render_table(pages, headers, widths, numeric, table_format)
+
+
+def render_csv(
+    file_name: str,
+    first_n: int = None,
+    has_header_row: bool = False,
+    table_format: TableFormat = TableFormat.fancy_outline,
+    tail: bool = False,
+    offset: int = 0,
+    where: list[str] = (),
+    use_index: bool = False,
+) -> str:
+    """Renders a CSV file as a single table string (see `stream_csv`)"""
+    pages = stream_csv(
+        file_name,
+        first_n,
+        has_header_row,
+        table_format,
+        tail,
+        offset=offset,
+        where=where,
+        use_index=use_index,
+    )
+    return "\n".join(pages)
+
+
+def _column_layout(headers: list[str] | None, sample: list[list[str]]):
+    column_count = max((len(row) for row in chain([headers or []], sample)), default=0)
+    widths = [len(header) for header in headers or []] + [0] * column_count
+    numeric = [True] * column_count
+    has_values = [False] * column_count
+    for row in sample:
+        for i, value in enumerate(row):
+            widths[i] = max(widths[i], len(value))
+            if value:
+                has_values[i] = True
+                if not _is_number(value):
+                    numeric[i] = False
+    # columns with no values at all are not numeric either
+    return widths[:column_count], [n and v for n, v in zip(numeric, has_values)]
+
+
+def _is_number(value: str) -> bool:
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _fit(value: str, width: int, numeric: bool = False) -> str:
+    # rows must fit on a single line for the pages to line up
+    value = value.replace("\r", " ").replace("\n", " ")
+    if len(value) > width:
+        # a zero width column has no room, even for the ellipsis
+        return value[: width - 1] + "…" if width > 0 else ""
+    return value.rjust(width) if numeric else value.ljust(width)
+
+
+def _pad_row(row: list[str], column_count: int) -> list[str]:
+    return (row + [""] * column_count)[:column_count]
+
+
+def _render_table(pages, headers, widths, numeric, table_format: TableFormat) -> Iterator[str]:
+    """Renders pages of rows as a single table: the header and top border once, then the
+    rows of each page, then the bottom border"""
+    top, separator, bottom = _table_frame(headers, widths, numeric, table_format)
+    if top:
+        yield "\n".join(top)
+
+    for i, page in enumerate(pages):
+        lines = _tabulate_rows(page, headers, widths, numeric, table_format)
+        # the rows are rendered between two marker rows, which are dropped along with the
+        #   separators between them and the rows - except between this page and the last one
+        first, last = _marker_lines(lines)
+        body = lines[first + 1 : last - len(separator)]
+        yield "\n".join(body if i else body[len(separator) :])
+
+    if bottom:
+        yield "\n".join(bottom)
+
+
+def _table_frame(headers, widths, numeric, table_format: TableFormat):
+    """The lines above the rows of the table, between two rows, and below the rows"""
+    lines = _tabulate_rows([], headers, widths, numeric, table_format)
+    first, last = _marker_lines(lines)
+    return lines[:first], lines[first + 1 : last], lines[last + 1 :]
+
+
+def _marker_lines(lines: list[str]) -> tuple[int, int]:
+    markers = [i for i, line in enumerate(lines) if ROW_MARKER in line]
+    return markers[0], markers[-1]
+
+
+def _tabulate_rows(rows, headers, widths, numeric, table_format: TableFormat) -> list[str]:
+    # zero width columns get the width of the marker, on every page
+    marker_row = [ROW_MARKER.ljust(width) for width in widths]
+    cells = [
+        [
+            _fit(value, width, is_numeric)
+            for value, width, is_numeric in zip(_pad_row(row, len(widths)), widths, numeric)
+        ]
+        for row in rows
+    ]
+    fitted_headers = [
+        _fit(header, width, is_numeric)
+        for header, width, is_numeric in zip(headers or (), widths, numeric)
+    ]
+
+    # values are already padded to the same width on every page, so tabulate must neither
+    #   strip nor reformat them - only align them, when it adds room for the headers
+    table = tabulate(
+        [marker_row, *cells, marker_row],
+        headers=fitted_headers or (),
+        tablefmt=table_format.value,
+        disable_numparse=True,
+        preserve_whitespace=True,
+        colalign=["right" if is_numeric else "left" for is_numeric in numeric] or None,
+    )
+    return table.splitlines()
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _tail_rows(file_name: str, n: int, has_header_row: bool) -> list[list[str]]:
+    lines, reached_start = _tail_lines(file_name, n + 1)
+    if reached_start and has_header_row:
+        # the whole file fits in the tail, header row included
+        lines = lines[1:]
+    return list(csv.reader(lines[-n:]))
+
+
+def _tail_lines(file_name: str, n: int) -> tuple[list[str], bool]:
+    """Reads the last `n` lines of a file, reading blocks backwards from the end of the file.
+
+    Returns the lines, and whether the start of the file was reached.
+    """
+    with open(file_name, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        data = b""
+        # one extra line break is needed to be sure the first line is complete
+        while position > 0 and data.count(b"\n") <= n:
+            block_size = min(BLOCK_SIZE, position)
+            position -= block_size
+            f.seek(position)
+            data = f.read(block_size) + data
 
-    if headers:
-        return tabulate(rows, headers=headers, tablefmt=table_format.value)
-    else:
-        return tabulate(rows)
+    # the first line may have been cut in the middle of a character, and is discarded anyway
+    lines = data.decode(errors="replace").splitlines()
+    reached_start = position == 0 and len(lines) <= n
+    return lines[-n:], reached_start
@@ -1,17 +1,275 @@
 import json
+import re
+from itertools import islice
+from json.decoder import scanstring
+from typing import Iterator, TextIO
 
+CHUNK_SIZE = 64 * 1024  # characters read at a time when streaming
 
-def preview_json(file_name: str, first_n: int = None, indent: int = 2) -> str:
+_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+_NUMBER_RE = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?")
+_NUMBER_CHARS_RE = re.compile(r"[-+.eE\d]+")
+_LITERALS = ("true", "false", "null")
+_SELECT_RE = re.compile(
+    r"\.(?P<key>[^.\[\]]+)|\[(?P<index>\d+|\*)\]|\[[\"'](?P<quoted>[^\"']*)[\"']\]"
+)
+WILDCARD = "*"
+
+
+def stream_json(
+    file_name: str, first_n: int = None, indent: int = 2, select: str = None
+) -> Iterator[str]:
+    """Pretty-prints a JSON file, one line at a time, as it is being parsed.
+
+    The file is parsed incrementally, so only as much of the file as is needed to
+    produce the first `first_n` lines is ever read. Files containing several documents,
+    such as JSON lines files, are printed one document after the other.
+
+    `select` is a JSONPath-like expression, such as `$.results[*].name` or `$[0]`,
+    to only print the matching values (each one as a separate document).
+
+    Output is the same as `json.dumps(data, indent=indent)` - except for numbers, which are
+    printed as they are in the file. With an indent of 0, each document is printed on
+    a single line (and `first_n` then counts documents).
+    """
     with open(file_name) as f:
-        data = json.load(f)
-
-    formatted_data = json.dumps(data, indent=indent)
-
-    if indent == 0:
-        result = formatted_data.replace("\n", "")
-    else:
-        formatted_data = formatted_data.split("\n")
-        if first_n:
-            formatted_data = formatted_data[:first_n]
-        result = "\n".join(formatted_data)
-    return result
+        events = iter_events(f)
+        if select:
+            events = _select(events, parse_select(select))
+        yield from islice(_pretty_lines(events, indent), first_n)
+
+
+def iter_events(f: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[tuple, str, str]]:
+    """Parses JSON incrementally, yielding `(path, event, value)` tuples.
+
+    Events are `start_map`, `map_key`, `end_map`, `start_array`, `end_array`, `string`,
+    `number` and `literal` (`true`, `false`, `null`). Numbers and literals are yielded as
+    the text found in the file. `path` is a tuple of the keys and indexes leading to
+    the value.
+
+    Invalid JSON (including a file that ends with containers still open) raises a
+    `ValueError`.
+    """
+    # for each open container: its kind, the key (or index) of the current item, and what
+    # is expected next (one of the states below)
+    stack = []
+    for token, value in _tokens(f, chunk_size):
+        state = stack[-1][2] if stack else _VALUE
+
+        if token == ",":
+            if state != _NEXT:
+                raise _unexpected(token)
+            stack[-1][2] = _KEY if stack[-1][0] == "map" else _VALUE
+            continue
+
+        if token == ":":
+            if state != _COLON:
+                raise _unexpected(token)
+            stack[-1][2] = _VALUE
+            continue
+
+        if token in "}]":
+            kind = "map" if token == "}" else "array"
+            if not stack or stack[-1][0] != kind or state not in (_FIRST, _NEXT):
+                raise _unexpected(token)
+            stack.pop()
+            yield tuple(frame[1] for frame in stack), f"end_{kind}", None
+            _value_done(stack)
+            continue
+
+        if stack and stack[-1][0] == "map" and state in (_FIRST, _KEY):
+            if token != "string":
+                raise _unexpected(token, value)
+            stack[-1][1:] = [value, _COLON]
+            yield tuple(frame[1] for frame in stack[:-1]), "map_key", value
+            continue
+        if state not in (_FIRST, _VALUE):
+            raise _unexpected(token, value)
+
+        if stack and stack[-1][0] == "array":
+            stack[-1][1] += 1
+        path = tuple(frame[1] for frame in stack)
+        if token == "{":
+            yield path, "start_map", None
+            stack.append(["map", None, _FIRST])
+        elif token == "[":
+            yield path, "start_array", None
+            stack.append(["array", -1, _FIRST])
+        else:
+            yield path, token, value
+            _value_done(stack)
+
+    if stack:
+        raise ValueError("Invalid JSON: unexpected end of file")
+
+
+# parser states - what is expected next in the innermost container
+_FIRST = "first"  # the first key of a map (or value of an array), or the closing bracket
+_KEY = "key"  # a key, after a comma
+_COLON = "colon"  # the colon after a key
+_VALUE = "value"  # a value, after a colon (or a comma, in arrays)
+_NEXT = "next"  # a comma, or the closing bracket
+
+
+def _value_done(stack: list):
+    if stack:
+        stack[-1][2] = _NEXT
+
+
+def _unexpected(token: str, value: str = None) -> ValueError:
+    found = token if value is None else json.dumps(value) if token == "string" else value
+    return ValueError(f"Invalid JSON: unexpected {found}")
+
+
+def _tokens(f: TextIO, chunk_size: int) -> Iterator[tuple[str, str]]:
+    buffer, position, eof = "", 0, False
+    while True:
+        position = _WHITESPACE_RE.match(buffer, position).end()
+        token = _next_token(buffer, position, eof) if position < len(buffer) else None
+
+        if token is None:
+            # the next token is (or may be) incomplete - read some more
+            if eof:
+                if position < len(buffer):
+                    raise ValueError(f"Invalid JSON: {buffer[position:position + 20]!r}")
+                return
+            chunk = f.read(chunk_size)
+            buffer, position, eof = buffer[position:] + chunk, 0, not chunk
+            continue
+
+        kind, value, position = token
+        yield kind, value
+
+
+def _next_token(buffer: str, position: int, eof: bool):
+    char = buffer[position]
+    if char in "{}[]:,":
+        return char, None, position + 1
+
+    if char == '"':
+        try:
+            value, end = scanstring(buffer, position + 1)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            return None
+        return "string", value, end
+
+    match = _NUMBER_CHARS_RE.match(buffer, position)
+    if match:
+        if match.end() == len(buffer) and not eof:
+            return None  # the buffer may end in the middle of the number
+        if _NUMBER_RE.fullmatch(match.group()):
+            return "number", match.group(), match.end()
+
+    for literal in _LITERALS:
+        if buffer.startswith(literal, position):
+            return "literal", literal, position + len(literal)
+        if not eof and literal.startswith(buffer[position : position + len(literal)]):
+            return None  # the buffer ends in the middle of the literal
+
+    raise ValueError(f"Invalid JSON: {buffer[position:position + 20]!r}")
+
+
+def parse_select(select: str) -> tuple:
+    """Parses a JSONPath-like expression (e.g. `$.results[*].name`) into path components"""
+    expression = select.strip()
+    expression = expression[1:] if expression.startswith("$") else expression
+    if expression and expression[0] not in ".[":
+        expression = f".{expression}"
+
+    components = []
+    position = 0
+    while position < len(expression):
+        match = _SELECT_RE.match(expression, position)
+        if not match:
+            raise ValueError(f"Invalid select expression: {select}")
+        key, index, quoted = match.group("key", "index", "quoted")
+        if index is not None:
+            components.append(WILDCARD if index == WILDCARD else int(index))
+        else:
+            components.append(quoted if quoted is not None else key)
+        position = match.end()
+    return tuple(components)
+
+
+def _matches(path: tuple, pattern: tuple) -> bool:
+    return len(path) == len(pattern) and all(
+        expected == WILDCARD or expected == actual for actual, expected in zip(path, pattern)
+    )
+
+
+def _select(events, pattern: tuple):
+    depth = 0  # depth inside the value currently selected (if any)
+    for path, event, value in events:
+        if depth:
+            yield path, event, value
+            if event.startswith("start_"):
+                depth += 1
+            elif event.startswith("end_"):
+                depth -= 1
+        elif event not in ("map_key", "end_map", "end_array") and _matches(path, pattern):
+            yield path, event, value
+            if event.startswith("start_"):
+                depth = 1
+
+
+def _pretty_lines(events, indent: int) -> Iterator[str]:
+    pending = None  # the last line, held until we know if it needs a trailing comma
+    document = []  # lines of the current document, when printing each one on a single line
+    stack = []  # for each open container: its closing bracket, and its number of items
+    key = None
+
+    def flush():
+        nonlocal pending
+        line, pending = pending, None
+        if indent:
+            return [line]
+        document.append(line)
+        if stack:
+            return []
+        lines = ["".join(document)]
+        document.clear()
+        return lines
+
+    for _, event, value in events:
+        if event == "map_key":
+            key = value
+            continue
+
+        if event in ("end_map", "end_array"):
+            closing, item_count = stack[-1]
+            if item_count:
+                yield from flush()
+                pending = " " * (indent * (len(stack) - 1)) + closing
+            else:
+                pending += closing
+            stack.pop()
+            if not stack:
+                yield from flush()
+            continue
+
+        prefix = " " * (indent * len(stack))
+        if stack:
+            if stack[-1][1]:
+                pending += ","
+            stack[-1][1] += 1
+        if key is not None:
+            prefix += f"{json.dumps(key)}: "
+            key = None
+        if pending is not None:
+            yield from flush()
+
+        if event == "start_map":
+            pending = f"{prefix}{{"
+            stack.append(["}", 0])
+        elif event == "start_array":
+            pending = f"{prefix}["
+            stack.append(["]", 0])
+        else:
+            pending = prefix + (json.dumps(value) if event == "string" else value)
+            if not stack:
+                yield from flush()
+
+    if pending is not None:
+        yield from flush()
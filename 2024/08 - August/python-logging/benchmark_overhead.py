@@ -0,0 +1,244 @@
+"""Logging overhead benchmark
+
+Measures what logging costs the app, for the logging configurations used in the examples:
+- ns/call: how long a `logger.info` call takes, when INFO is enabled, and when it is disabled
+- bytes/record: the peak memory allocated (traced with tracemalloc) while a single record is logged
+- records/sec: the throughput of 1 and 4 threads logging at the same time, until every record was handled
+
+Records are written to /dev/null, or to files in a temporary directory for the file handlers.
+
+Run it from this directory, for all the configurations, or only some of them:
+    python benchmark_overhead.py
+    python benchmark_overhead.py json_10 queue
+"""
+
+import importlib.util
+import logging
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from logging.handlers import RotatingFileHandler
+from typing import Callable
+
+EXAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CALL_COUNT = 20_000
+ALLOC_RECORD_COUNT = 1_000
+THREAD_COUNTS = (1, 4)
+RECORD_COUNT = 40_000  # logged by all the threads together
+HIERARCHY_DEPTH = 8
+
+SIMPLE_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def load_example(example: str):
+    """Imports the main module of an example (they all have the same name, so they cannot be imported as usual)"""
+    path = os.path.join(EXAMPLES_DIR, example, "main.py")
+    spec = importlib.util.spec_from_file_location(f"{example}_main", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def example_12_modules():
+    # example 12 is a package of modules, that import each other from the example's directory
+    sys.path.insert(0, os.path.join(EXAMPLES_DIR, "example_12"))
+    from configs import log_queue, logger_formatters
+
+    return log_queue, logger_formatters
+
+
+class Config:
+    """A logging configuration: `setup` attaches handlers to the logger, and returns a function that
+    waits for the records to be handled, and closes the handlers"""
+
+    def __init__(
+        self,
+        name: str,
+        setup: Callable[[logging.Logger, str], Callable[[], None]],
+        logger_name: str | None = None,
+    ):
+        self.name = name
+        self.setup = setup
+        self.logger_name = logger_name or f"benchmark.{name}"
+
+    def logger(self) -> logging.Logger:
+        logger = logging.getLogger(self.logger_name)
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        return logger
+
+
+def stream_handler(formatter: logging.Formatter, *filters: logging.Filter):
+    def setup(logger: logging.Logger, log_dir: str) -> Callable[[], None]:
+        stream = open(os.devnull, "w")
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(formatter)
+        for filter_ in filters:
+            handler.addFilter(filter_)
+        logger.handlers = [handler]
+
+        def teardown():
+            handler.close()
+            stream.close()
+
+        return teardown
+
+    return setup
+
+
+def file_handler(handler_factory: Callable[[str], logging.Handler]):
+    def setup(logger: logging.Logger, log_dir: str) -> Callable[[], None]:
+        handler = handler_factory(os.path.join(log_dir, f"{logger.name}.log"))
+        handler.setFormatter(logging.Formatter(SIMPLE_FORMAT))
+        logger.handlers = [handler]
+        return handler.close
+
+    return setup
+
+
+def queue_handler(log_queue_module):
+    def setup(logger: logging.Logger, log_dir: str) -> Callable[[], None]:
+        handler = logging.FileHandler(os.path.join(log_dir, f"{logger.name}.log"))
+        handler.setFormatter(logging.Formatter(SIMPLE_FORMAT))
+        records = queue.Queue(10_000)
+        listener = log_queue_module.RoutingQueueListener(records)
+        logger.handlers = [log_queue_module.BoundedQueueHandler(records, [handler], policy="block")]
+        listener.start()
+
+        def teardown():
+            listener.stop()
+            handler.close()
+
+        return teardown
+
+    return setup
+
+
+def hierarchy(logger_name: str, depth: int):
+    # the handler is attached to the top of the hierarchy - records propagate up to it, from the bottom logger
+    def setup(logger: logging.Logger, log_dir: str) -> Callable[[], None]:
+        logger.propagate = True
+        parent = logging.getLogger(logger_name)
+        parent.propagate = False
+        for depth_name in (logger.name.rsplit(".", i)[0] for i in range(1, depth)):
+            logging.getLogger(depth_name).propagate = True
+        return stream_handler(logging.Formatter(SIMPLE_FORMAT))(parent, log_dir)
+
+    return setup
+
+
+def configurations() -> list[Config]:
+    example_09 = load_example("example_09")
+    example_10 = load_example("example_10")
+    example_11 = load_example("example_11")
+    log_queue, logger_formatters = example_12_modules()
+
+    deep_name = ".".join(["benchmark.deep"] + [f"level_{i}" for i in range(1, HIERARCHY_DEPTH)])
+    return [
+        Config("plain", stream_handler(logging.Formatter(SIMPLE_FORMAT))),
+        Config("json_10", stream_handler(example_10.JSONFormatter())),
+        Config("fast_json_10", stream_handler(example_10.FastJSONFormatter())),
+        Config("json_11", stream_handler(example_11.JSONFormatter())),
+        Config("json_12", stream_handler(logger_formatters.JSONFormatter())),
+        Config(
+            "filter",
+            stream_handler(
+                logging.Formatter(SIMPLE_FORMAT), example_09.CustomFilter("itemId", 100)
+            ),
+        ),
+        Config("file", file_handler(logging.FileHandler)),
+        Config(
+            "rotating",
+            file_handler(lambda name: RotatingFileHandler(name, maxBytes=1_000_000, backupCount=3)),
+        ),
+        Config("queue", queue_handler(log_queue)),
+        Config("deep", hierarchy("benchmark.deep", HIERARCHY_DEPTH), deep_name),
+    ]
+
+
+def ns_per_call(log: Callable[..., None]) -> float:
+    start = time.perf_counter_ns()
+    for i in range(CALL_COUNT):
+        log("Processing item %s", i, extra={"itemId": i})
+    return (time.perf_counter_ns() - start) / CALL_COUNT
+
+
+def bytes_per_record(logger: logging.Logger) -> float:
+    total = 0
+    tracemalloc.start()
+    for i in range(ALLOC_RECORD_COUNT):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        logger.info("Processing item %s", i, extra={"itemId": i})
+        _, peak = tracemalloc.get_traced_memory()
+        total += peak - before
+    tracemalloc.stop()
+    return total / ALLOC_RECORD_COUNT
+
+
+def records_per_second(config: Config, log_dir: str, thread_count: int) -> float:
+    logger = config.logger()
+    teardown = config.setup(logger, log_dir)
+    records_per_thread = RECORD_COUNT // thread_count
+
+    def log_records():
+        for i in range(records_per_thread):
+            logger.info("Processing item %s", i, extra={"itemId": i})
+
+    threads = [threading.Thread(target=log_records) for _ in range(thread_count)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    teardown()  # includes handling the records still queued
+    return records_per_thread * thread_count / (time.perf_counter() - start)
+
+
+def benchmark(config: Config, log_dir: str) -> list[str]:
+    logger = config.logger()
+    teardown = config.setup(logger, log_dir)
+    enabled_ns = ns_per_call(logger.info)
+    disabled_ns = ns_per_call(logger.debug)
+    allocated = bytes_per_record(logger)
+    teardown()
+
+    throughputs = [records_per_second(config, log_dir, count) for count in THREAD_COUNTS]
+    return [
+        config.name,
+        f"{enabled_ns:,.0f}",
+        f"{disabled_ns:,.0f}",
+        f"{allocated:,.0f}",
+        *(f"{throughput:,.0f}" for throughput in throughputs),
+    ]
+
+
+def main():
+    selected = set(sys.argv[1:])
+    configs = [config for config in configurations() if not selected or config.name in selected]
+    if unknown := selected - {config.name for config in configs}:
+        sys.exit(f"Unknown configurations: {', '.join(sorted(unknown))}")
+
+    headers = [
+        "config",
+        "enabled ns/call",
+        "disabled ns/call",
+        "bytes/record",
+        *(f"records/sec ({count} thr)" for count in THREAD_COUNTS),
+    ]
+    widths = [14] + [max(len(header), 12) for header in headers[1:]]
+    print("  ".join(header.rjust(width) for header, width in zip(headers, widths)))
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        for config in configs:
+            row = benchmark(config, log_dir)
+            print("  ".join(value.rjust(width) for value, width in zip(row, widths)), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -24,10 +24,24 @@ You'll see in the configuration file that we use something weird in the filter d
 This is meant to be a hint to the logging system that it should instantiate the class, and pass the
 configuration.
 This is documented here: https://docs.python.org/3/library/logging.config.html#user-defined-objects
+
+Filters are also a good way to keep log volume under control, for example when something goes wrong and the same
+warning gets logged thousands of times per second. Since handlers run their filters before formatting records,
+records that are filtered out do not cost any formatting (or I/O) either:
+- SamplingFilter only keeps a random fraction of the records, configured by logger and level (e.g. 1% of DEBUG logs)
+- RateLimitFilter limits how often records with the same message template (the message *before* the args are
+  interpolated) get through, with a token bucket per template, and every so often logs a summary of how many
+  similar messages were suppressed
+
+To see the rate limit filter at work on a flood of warnings, run: python main.py rate-limit
 """
 
 import logging
 import logging.config
+import random
+import sys
+import threading
+import time
 
 from yaml import safe_load
 
@@ -51,11 +65,154 @@ class CustomFilter(logging.Filter):
         )
 
 
+class SamplingFilter(logging.Filter):
+    def __init__(self, rates: dict[str, dict[str | int, float]] = None, default_rate: float = 1.0):
+        """Keeps a random sample of the records.
+
+        `rates` gives the fraction of records kept, by logger name, then level - e.g. {"app": {"DEBUG": 0.01}}.
+        Rates configured for a logger also apply to its children (unless they have their own). Records of any
+        other logger or level are kept at the `default_rate`.
+        """
+        super().__init__()
+        self.rates = {
+            logger_name: {
+                (logging.getLevelName(level) if isinstance(level, str) else level): rate
+                for level, rate in level_rates.items()
+            }
+            for logger_name, level_rates in (rates or {}).items()
+        }
+        self.default_rate = default_rate
+        self._rates_cache = {}  # (logger name, level) -> rate
+
+    def rate(self, logger_name: str, level: int) -> float:
+        try:
+            return self._rates_cache[logger_name, level]
+        except KeyError:
+            pass
+
+        rate = self.default_rate
+        name = logger_name
+        while name:
+            if level in self.rates.get(name, {}):
+                rate = self.rates[name][level]
+                break
+            name = name.rpartition(".")[0]
+        self._rates_cache[logger_name, level] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord):  # noqa: A003
+        rate = self.rate(record.name, record.levelno)
+        return rate >= 1 or random.random() < rate
+
+
+class RateLimitFilter(logging.Filter):
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 10,
+        summary_interval: float = 10.0,
+        max_templates: int = 10_000,
+    ):
+        """Limits records with the same logger and message template to `rate` per second (after an initial
+        `burst`).
+
+        Every `summary_interval` seconds (at most - the check is done as records come in), a WARNING is logged
+        for each template that had records suppressed, with the number of records suppressed. It only goes to
+        the handlers (or loggers) the filter is attached to - see attach_rate_limit_filters. At most
+        `max_templates` templates are tracked, in case messages are built with f-strings rather than args.
+        """
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.summary_interval = summary_interval
+        self.max_templates = max_templates
+        # (logger name, message template) -> [tokens, last refill time, suppressed count]
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._last_summary = time.monotonic()
+        self.targets = []  # the handlers (or loggers) this filter is attached to
+
+    def attach(self, target: logging.Handler | logging.Logger):
+        if target not in self.targets:
+            self.targets.append(target)
+
+    def filter(self, record: logging.LogRecord):  # noqa: A003
+        template = record.msg if isinstance(record.msg, str) else type(record.msg).__name__
+        key = (record.name, template)
+        now = time.monotonic()
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_templates:
+                    self._forget_idle_templates()
+                bucket = self._buckets[key] = [self.burst, now, 0]
+
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            allowed = tokens >= 1
+            if allowed:
+                bucket[0] = tokens - 1
+            else:
+                bucket[0] = tokens
+                bucket[2] += 1
+
+            summaries = []
+            if now - self._last_summary >= self.summary_interval:
+                self._last_summary = now
+                summaries = self._summary_records()
+
+        # handled outside the lock - summaries go through this filter too (under a template of their own)
+        for summary in summaries:
+            for target in self.targets:
+                if summary.levelno >= target.level:
+                    target.handle(summary)
+        return allowed
+
+    def _summary_records(self) -> list[logging.LogRecord]:
+        summaries = []
+        for (logger_name, template), bucket in self._buckets.items():
+            if bucket[2]:
+                summaries.append(
+                    logging.LogRecord(
+                        logger_name,
+                        logging.WARNING,
+                        __file__,
+                        0,
+                        "Suppressed %d similar messages: %r",
+                        (bucket[2], template),
+                        None,
+                    )
+                )
+                bucket[2] = 0
+        return summaries
+
+    def _forget_idle_templates(self):
+        # templates with no suppressed records are only needed to remember their tokens
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if bucket[2]}
+
+
 def configure_loggers():
     with open("logger_config.yaml") as f:
         config = safe_load(f)
 
     logging.config.dictConfig(config)
+    attach_rate_limit_filters()
+
+
+def attach_rate_limit_filters():
+    """Tells each rate limit filter which handlers and loggers it is attached to, so it can send its summaries
+    to them only (filters are not told what they filter)"""
+    loggers = [logging.getLogger()] + [
+        logger
+        for logger in logging.Logger.manager.loggerDict.values()
+        if isinstance(logger, logging.Logger)
+    ]
+    handlers = dict.fromkeys(handler for logger in loggers for handler in logger.handlers)
+    for filterer in [*loggers, *handlers]:
+        for filter_ in filterer.filters:
+            if isinstance(filter_, RateLimitFilter):
+                filter_.attach(filterer)
 
 
 def main():
@@ -64,6 +221,18 @@ def main():
     logger.error("Error message 3, my_arg=50", extra={"my_arg": 50})
 
 
+def rate_limit_demo():
+    # an incident: the same warning is logged over and over again - the rate limit filter only lets the first
+    #   few through, and then logs how many similar messages it suppressed
+    for i in range(10_000):
+        logger.warning("Disk almost full on %s", f"host-{i % 10}")
+    time.sleep(1)
+    logger.warning("Disk almost full on %s", "host-0")
+
+
 if __name__ == "__main__":
     configure_loggers()
-    main()
+    if sys.argv[1:] == ["rate-limit"]:
+        rate_limit_demo()
+    else:
+        main()
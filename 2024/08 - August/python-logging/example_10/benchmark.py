@@ -0,0 +1,56 @@
+"""Example 10 - benchmark
+
+Compares how many log records per second JSONFormatter and FastJSONFormatter can format, for a plain
+record, and for a record with a few extras.
+
+Run it from this directory: python benchmark.py
+"""
+
+import json
+import logging
+import time
+
+from main import FastJSONFormatter, JSONFormatter
+
+RECORD_COUNT = 20_000
+
+
+def make_record(extra: dict | None = None) -> logging.LogRecord:
+    record = logging.LogRecord(
+        "app", logging.INFO, __file__, 1, "Message: val=%s", ("value",), None
+    )
+    record.__dict__.update(extra or {})
+    return record
+
+
+def records_per_second(formatter: logging.Formatter, record: logging.LogRecord) -> float:
+    start = time.perf_counter()
+    for _ in range(RECORD_COUNT):
+        formatter.format(record)
+    return RECORD_COUNT / (time.perf_counter() - start)
+
+
+def main():
+    records = {
+        "plain record": make_record(),
+        "record with extras": make_record({"a": 1, "b": 2, "user_id": "u-123"}),
+    }
+    formatters = {"JSONFormatter": JSONFormatter(), "FastJSONFormatter": FastJSONFormatter()}
+
+    for description, record in records.items():
+        # both formatters log the same information
+        assert json.loads(formatters["JSONFormatter"].format(record)) == json.loads(
+            formatters["FastJSONFormatter"].format(record)
+        )
+
+        print(f"{description}:")
+        rates = {
+            name: records_per_second(formatter, record) for name, formatter in formatters.items()
+        }
+        for name, rate in rates.items():
+            print(f"  {name:<18} {rate:>12,.0f} records/sec")
+        print(f"  speedup: {rates['FastJSONFormatter'] / rates['JSONFormatter']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""File handler benchmark
+
+Compares FileHandler, which writes and flushes every record, with BufferedRotatingFileHandler (see
+configs/logger_handlers.py), which writes records in batches: records per second, and the number of write() system
+calls made (only reported on Linux, where /proc/self/io counts them).
+
+Run it from this directory: python benchmark_handlers.py
+"""
+
+import logging
+import os
+import tempfile
+import time
+
+from configs.logger_handlers import BufferedRotatingFileHandler
+
+RECORD_COUNT = 50_000
+FSYNC_RECORD_COUNT = 2_000  # fsync-ing every record is so slow that only a few records are logged
+
+
+def write_syscall_count() -> int | None:
+    try:
+        with open("/proc/self/io") as f:
+            counters = dict(line.split(": ") for line in f.read().splitlines())
+    except OSError:
+        return None
+    return int(counters["syscw"])
+
+
+def run(description: str, handler: logging.Handler, record_count: int = RECORD_COUNT):
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.handlers = [handler]
+
+    syscalls_before = write_syscall_count()
+    start = time.perf_counter()
+    for i in range(record_count):
+        logger.info("Processing item %s", i)
+    handler.close()
+    elapsed = time.perf_counter() - start
+    syscalls_after = write_syscall_count()
+
+    syscalls = (
+        "" if syscalls_before is None else f"{syscalls_after - syscalls_before:>8,} write() calls"
+    )
+    print(f"{description:<28} {record_count / elapsed:>10,.0f} records/sec {syscalls}")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as log_dir:
+        run("FileHandler", logging.FileHandler(os.path.join(log_dir, "file.log")))
+        run("buffered", BufferedRotatingFileHandler(os.path.join(log_dir, "buffered.log")))
+
+        fsync_file_name = os.path.join(log_dir, "fsync.log")
+        run("FileHandler + fsync", FsyncFileHandler(fsync_file_name), FSYNC_RECORD_COUNT)
+        buffered_fsync_file_name = os.path.join(log_dir, "buffered_fsync.log")
+        buffered_handler = BufferedRotatingFileHandler(buffered_fsync_file_name, fsync=True)
+        run("buffered + fsync", buffered_handler, FSYNC_RECORD_COUNT)
+
+
+class FsyncFileHandler(logging.FileHandler):
+    """A FileHandler that syncs each record to disk"""
+
+    def flush(self):
+        super().flush()
+        if self.stream:
+            os.fsync(self.stream.fileno())
+
+
+if __name__ == "__main__":
+    main()
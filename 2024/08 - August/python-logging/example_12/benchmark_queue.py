@@ -0,0 +1,84 @@
+"""Logging latency benchmark
+
+Measures how long each `logger.info` call blocks the calling thread, with the handlers attached directly to the
+loggers, and with the handlers moved behind a queue (see configs/log_queue.py).
+
+The handlers write JSON to a file, and plain text to a stream - run it from this directory: python benchmark_queue.py
+"""
+
+import logging
+import logging.config
+import os
+import statistics
+import tempfile
+import time
+
+from configs.log_queue import LogQueue
+
+CALL_COUNT = 20_000
+
+
+def configure(log_dir: str):
+    logging.config.dictConfig(
+        {
+            "version": 1,
+            "disable_existing_loggers": False,
+            "formatters": {
+                "json": {"()": "configs.logger_formatters.JSONFormatter"},
+                "simple": {"format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"},
+            },
+            "handlers": {
+                "file": {
+                    "class": "logging.FileHandler",
+                    "formatter": "json",
+                    "filename": os.path.join(log_dir, "app.log"),
+                },
+                "stream": {
+                    "class": "logging.StreamHandler",
+                    "formatter": "simple",
+                    "stream": open(os.path.join(log_dir, "stream.log"), "w"),
+                },
+            },
+            "root": {"level": "DEBUG", "handlers": ["file", "stream"]},
+        }
+    )
+
+
+def measure(logger: logging.Logger) -> list[float]:
+    """Returns the duration of each logging call, in microseconds"""
+    durations = []
+    for i in range(CALL_COUNT):
+        start = time.perf_counter_ns()
+        logger.info("Processing item %s", i, extra={"itemId": i})
+        durations.append((time.perf_counter_ns() - start) / 1000)
+    return durations
+
+
+def report(description: str, durations: list[float]):
+    percentiles = statistics.quantiles(durations, n=100)
+    print(
+        f"{description:<36} mean {statistics.fmean(durations):7.2f} µs   p50 {percentiles[49]:7.2f} µs   "
+        f"p99 {percentiles[98]:7.2f} µs   max {max(durations):9.2f} µs"
+    )
+
+
+def main():
+    logger = logging.getLogger("benchmark")
+    with tempfile.TemporaryDirectory() as log_dir:
+        configure(log_dir)
+        report("handlers attached to loggers", measure(logger))
+
+        for maxsize, policy in ((CALL_COUNT, "block"), (1_000, "block"), (1_000, "drop")):
+            configure(log_dir)
+            log_queue = LogQueue(maxsize=maxsize, policy=policy)
+            log_queue.start()
+            durations = measure(logger)
+            log_queue.stop()  # reports the number of records dropped, if any
+            report(f"queue (maxsize={maxsize}, {policy})", durations)
+
+        # close the handlers, before the files are deleted
+        logging.config.dictConfig({"version": 1})
+
+
+if __name__ == "__main__":
+    main()
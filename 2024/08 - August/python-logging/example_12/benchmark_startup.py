@@ -0,0 +1,115 @@
+"""Logging startup benchmark
+
+Measures, in fresh processes:
+- how long importing configs.log_config takes
+- how long configure_loggers takes, parsing logger_config.yaml (no cached snapshot), and loading the cached
+  JSON snapshot of the config
+- how long the first logging call then takes
+
+It also compares the cost of `isEnabledFor` checks with a plain `Logger.disabled` attribute, and with the property
+that used to be patched onto Logger to report the loggers being disabled.
+
+Run it from this directory: python benchmark_startup.py
+"""
+
+import json
+import logging
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+EXAMPLE_DIR = os.path.dirname(os.path.abspath(__file__))
+RUN_COUNT = 10
+CALL_COUNT = 1_000_000
+
+STARTUP_SCRIPT = """
+import json, logging, sys, time
+
+start = time.perf_counter()
+from configs import log_config
+imported = time.perf_counter()
+log_config.configure_loggers()
+configured = time.perf_counter()
+logging.getLogger("my_app").info("First message")
+logged = time.perf_counter()
+
+log_config.stop_loggers()
+print(json.dumps([imported - start, configured - imported, logged - configured]), file=sys.stderr)
+"""
+
+
+def startup_times(work_dir: str) -> list[float]:
+    """The import, configuration and first log durations of a new process, in milliseconds"""
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT],
+        cwd=work_dir,
+        env={**os.environ, "PYTHONPATH": EXAMPLE_DIR},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=True,
+        text=True,
+    )
+    return [duration * 1000 for duration in json.loads(result.stderr.splitlines()[-1])]
+
+
+def report_startup(description: str, runs: list[list[float]]):
+    imported, configured, logged = (statistics.median(durations) for durations in zip(*runs))
+    print(
+        f"{description:<22} import {imported:6.2f} ms   configure {configured:6.2f} ms   "
+        f"first log {logged:6.2f} ms"
+    )
+
+
+def patch_disabled_property():
+    """The property configs.log_config used to patch onto Logger, to report where loggers get disabled"""
+
+    @property
+    def disabled(self):
+        try:
+            return self._disabled
+        except AttributeError:
+            return False
+
+    @disabled.setter
+    def disabled(self, disabled):
+        self._disabled = disabled
+
+    logging.Logger.disabled = disabled
+
+
+def ns_per_check(logger: logging.Logger) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(CALL_COUNT):
+        logger.isEnabledFor(logging.DEBUG)
+    return (time.perf_counter_ns() - start) / CALL_COUNT
+
+
+def main():
+    with tempfile.TemporaryDirectory() as work_dir:
+        shutil.copy(os.path.join(EXAMPLE_DIR, "logger_config.yaml"), work_dir)
+        os.mkdir(os.path.join(work_dir, "logs"))
+        cache_dir = os.path.join(work_dir, "__pycache__")
+
+        cold_runs = []
+        for _ in range(RUN_COUNT):
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            cold_runs.append(startup_times(work_dir))
+        report_startup("YAML config", cold_runs)
+        report_startup("cached JSON snapshot", [startup_times(work_dir) for _ in range(RUN_COUNT)])
+
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.INFO)
+    print(f"{'isEnabledFor':<22} {ns_per_check(logger):6.1f} ns/call")
+    patch_disabled_property()
+    # created after the patch, so that it has a _disabled attribute (as loggers created after it did)
+    logger = logging.getLogger("benchmark.patched")
+    logger.setLevel(logging.INFO)
+    print(f"{'  with the property':<22} {ns_per_check(logger):6.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
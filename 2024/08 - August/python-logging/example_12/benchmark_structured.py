@@ -0,0 +1,65 @@
+"""Structured logging benchmark
+
+Compares the cost of a logging call with an expensive extra, computed up front with a plain logger, and
+computed lazily with StructuredLoggerAdapter (see configs/structured_logging.py) - when the level is enabled
+(the records are formatted as JSON, and written to /dev/null), and when it is disabled.
+
+Run it from this directory: python benchmark_structured.py
+"""
+
+import logging
+import os
+import time
+
+from configs.logger_formatters import JSONFormatter
+from configs.structured_logging import StructuredLoggerAdapter, lazy
+
+CALL_COUNT = 20_000
+ROWS = [{"id": i, "amount": i * 1.5} for i in range(100)]
+
+
+def summarize(rows: list[dict]) -> dict:
+    """The expensive value we want to log"""
+    amounts = sorted(row["amount"] for row in rows)
+    return {"count": len(amounts), "total": sum(amounts), "median": amounts[len(amounts) // 2]}
+
+
+def eager(logger: logging.Logger):
+    logger.debug("Query results", extra={"rows": summarize(ROWS)})
+
+
+def lazily(logger: StructuredLoggerAdapter):
+    logger.debug("Query results", extra={"rows": lazy(summarize, ROWS)})
+
+
+def ns_per_call(log_call, logger) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(CALL_COUNT):
+        log_call(logger)
+    return (time.perf_counter_ns() - start) / CALL_COUNT
+
+
+def main():
+    logger = logging.getLogger("benchmark")
+    logger.propagate = False
+    adapter = StructuredLoggerAdapter(logger)
+
+    with open(os.devnull, "w") as devnull:
+        handler = logging.StreamHandler(devnull)
+        handler.setFormatter(JSONFormatter())
+        logger.addHandler(handler)
+
+        for level in (logging.DEBUG, logging.INFO):
+            logger.setLevel(level)
+            state = "enabled" if level == logging.DEBUG else "disabled"
+            eager_ns = ns_per_call(eager, logger)
+            lazy_ns = ns_per_call(lazily, adapter)
+            print(f"DEBUG {state}:")
+            print(f"  {'plain logger, eager extra':<32} {eager_ns:>10,.0f} ns/call")
+            print(f"  {'adapter, lazy extra':<32} {lazy_ns:>10,.0f} ns/call")
+
+        logger.removeHandler(handler)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Logging from multiple processes
+
+Handlers are not safe to share between processes: several processes writing to the same file interleave their
+writes, and RotatingFileHandler ends up renaming files other processes are still writing to.
+
+Instead, a single aggregator process runs the configured handlers. Every other process (the main process and,
+for example, the workers of a multiprocessing Pool) gets a single handler on its root logger, that sends records
+to the aggregator over a multiprocessing queue:
+
+    aggregator = LogAggregator(config)
+    aggregator.start()
+    pool = Pool(processes=4, **aggregator.pool_initializer())
+    ...
+    pool.close()
+    pool.join()
+    aggregator.stop()
+
+The records a process sends are written to the queue by a background thread: close and join pools, rather than
+terminating them (as `with Pool(...)` does on exit), or the last records of their workers could be lost.
+"""
+
+import logging
+import logging.config
+import multiprocessing
+import signal
+import traceback
+from logging.handlers import QueueHandler
+from typing import Any, Callable
+
+from configs.structured_logging import resolve
+
+
+class ProcessQueueHandler(QueueHandler):
+    """Sends records to the aggregator process"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Records are pickled to be sent to the aggregator: QueueHandler.prepare merges the message with its
+        #   args, and formats exceptions as text (tracebacks cannot be pickled). Lazy extras cannot be pickled
+        #   either, so they are evaluated now.
+        record = super().prepare(record)
+        for key, value in record.__dict__.items():
+            record.__dict__[key] = resolve(value)
+        return record
+
+
+def configure_process(log_queue: multiprocessing.Queue, levels: dict[str, int | str]):
+    """Sends the records of this process to the aggregator, keeping the configured logger levels.
+
+    This replaces the handlers the process had: all records propagate to the root logger's handler, and the
+    aggregator hands them to the logger they were logged with, which has the configured handlers.
+    """
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(ProcessQueueHandler(log_queue))
+
+    for name, level in levels.items():
+        logger = logging.getLogger(name) if name != "root" else root
+        logger.setLevel(level)
+        if logger is not root:
+            logger.handlers.clear()
+            logger.propagate = True
+
+
+def _initialize_worker(
+    log_queue: multiprocessing.Queue,
+    levels: dict[str, int | str],
+    initializer: Callable[..., None] | None,
+    initargs: tuple,
+):
+    configure_process(log_queue, levels)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _aggregate(log_queue: multiprocessing.Queue, config: dict[str, Any]):
+    # stopped by the process that started it (with a None sentinel), not by Ctrl+C - the other processes
+    #   may still have records to send
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.config.dictConfig(config)
+
+    while (record := log_queue.get()) is not None:
+        try:
+            logger = logging.getLogger(record.name)
+            if logger.isEnabledFor(record.levelno):
+                logger.handle(record)
+        except Exception:
+            traceback.print_exc()
+    logging.shutdown()
+
+
+class LogAggregator:
+    """Runs the handlers of a dict config in a separate process, that all other processes send records to"""
+
+    def __init__(self, config: dict[str, Any], maxsize: int = 0):
+        self.config = config
+        self.queue = multiprocessing.Queue(maxsize)
+        self.process = multiprocessing.Process(
+            target=_aggregate, args=(self.queue, config), name="log-aggregator", daemon=True
+        )
+
+    @property
+    def levels(self) -> dict[str, int | str]:
+        """The levels of the configured loggers"""
+        loggers = dict(self.config.get("loggers", {}))
+        if "root" in self.config:
+            loggers["root"] = self.config["root"]
+        return {name: logger["level"] for name, logger in loggers.items() if "level" in logger}
+
+    def start(self):
+        """Starts the aggregator process, and sends the records of this process to it"""
+        self.process.start()
+        configure_process(self.queue, self.levels)
+
+    def stop(self):
+        """Waits for the aggregator to handle the records sent to it (this process stops sending records)"""
+        if not self.process.is_alive():
+            return
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            if isinstance(handler, ProcessQueueHandler) and handler.queue is self.queue:
+                root.removeHandler(handler)
+
+        self.queue.put(None)
+        self.process.join()
+
+    def pool_initializer(
+        self, initializer: Callable[..., None] | None = None, initargs: tuple = ()
+    ) -> dict[str, Any]:
+        """The `initializer` and `initargs` arguments of a Pool, so that its workers log to the aggregator.
+
+        The pool's own initializer, if any, runs after that.
+        """
+        return {
+            "initializer": _initialize_worker,
+            "initargs": (self.queue, self.levels, initializer, initargs),
+        }
@@ -1,40 +1,134 @@
 """App Configuration"""
 
+import atexit
+import glob
+import hashlib
+import json
 import logging
 import logging.config
-import sys
+import os
 
-from yaml import safe_load
+from configs.log_queue import LogQueue
 
 
-def inspect_logger_disabling():
-    # sourced from: https://stackoverflow.com/a/28694704
-    @property
-    def disabled(self):
-        try:
-            return self._disabled
-        except AttributeError:
-            return False
+def disabled_loggers() -> set[str]:
+    return {
+        name
+        for name, logger in logging.Logger.manager.loggerDict.items()
+        if isinstance(logger, logging.Logger) and logger.disabled
+    }
 
-    @disabled.setter
-    def disabled(self, disabled):
-        if disabled:
-            frame = sys._getframe(1)
-            print(
-                f"{frame.f_code.co_filename}:{frame.f_lineno} "
-                f"disabled the {self.name} logger"
-            )
-        self._disabled = disabled
 
-    logging.Logger.disabled = disabled
+def report_disabled_loggers(previously_disabled: set[str]):
+    """Prints the loggers that were disabled since `previously_disabled` was taken.
 
+    Loggers created before the logging system is configured get disabled, unless the config sets
+    disable_existing_loggers to False. This compares the disabled loggers before and after configuring, instead
+    of intercepting `Logger.disabled` - every logging call checks that attribute, so it should stay a plain one.
+    """
+    for name in sorted(disabled_loggers() - previously_disabled):
+        print(f"configure_loggers disabled the {name} logger")
 
-def configure_loggers(raise_exceptions: bool = True):
-    with open("logger_config.yaml") as f:
-        config = safe_load(f)
 
+def _cache_file_name(file_name: str, digest: str) -> str:
+    directory, base_name = os.path.split(os.path.abspath(file_name))
+    return os.path.join(directory, "__pycache__", f"{base_name}.{digest}.json")
+
+
+def _load_config(file_name: str) -> tuple[dict, str | None]:
+    """The config, and the cache file to save it to - None if it was loaded from there"""
+    with open(file_name, "rb") as f:
+        contents = f.read()
+    cache_file_name = _cache_file_name(
+        file_name, hashlib.blake2b(contents, digest_size=16).hexdigest()
+    )
+    try:
+        with open(cache_file_name, "rb") as f:
+            return json.loads(f.read()), None
+    except (OSError, ValueError):
+        pass
+
+    from yaml import safe_load
+
+    return safe_load(contents), cache_file_name
+
+
+def load_config(file_name: str = "logger_config.yaml") -> dict:
+    """Loads the YAML config - or its JSON snapshot, if the file did not change since it was cached.
+
+    Parsing YAML (and importing PyYAML) takes a lot longer than loading JSON, so configs are cached under
+    the hash of the file's contents, once configure_loggers applied them successfully.
+    """
+    return _load_config(file_name)[0]
+
+
+def _snapshot(config: dict) -> str | None:
+    try:
+        return json.dumps(config)
+    except (TypeError, ValueError):
+        # YAML values JSON cannot represent (dates, ...) - the config is just not cached
+        return None
+
+
+def _save_snapshot(cache_file_name: str, snapshot: str):
+    try:
+        directory, base_name = os.path.split(cache_file_name)
+        os.makedirs(directory, exist_ok=True)
+        # snapshots of previous versions of the config file
+        config_base_name = base_name.rsplit(".", 2)[0]
+        for stale_file_name in glob.glob(os.path.join(directory, f"{config_base_name}.*.json")):
+            os.remove(stale_file_name)
+        # written to a temporary file first, so that another process never reads a partial snapshot
+        temp_file_name = f"{cache_file_name}.{os.getpid()}"
+        with open(temp_file_name, "w") as f:
+            f.write(snapshot)
+        os.replace(temp_file_name, cache_file_name)
+    except OSError:
+        pass  # the cache is only an optimization
+
+
+# the queue the handlers are moved behind, if the `queue` section of the config enables it
+log_queue: LogQueue | None = None
+
+
+def configure_loggers(raise_exceptions: bool = True, debug: bool = False):
+    """Configures logging from logger_config.yaml.
+
+    With `debug`, the loggers disabled by the configuration are reported.
+    """
+    global log_queue
+
+    config, cache_file_name = _load_config("logger_config.yaml")
+    snapshot = _snapshot(config) if cache_file_name else None
+
+    # the queue section is not part of the standard dict config
+    queue_config = config.pop("queue", None) or {}
+
+    stop_loggers()
+    previously_disabled = disabled_loggers() if debug else set()
     logging.config.dictConfig(config)
     logging.raiseExceptions = raise_exceptions
+    if debug:
+        report_disabled_loggers(previously_disabled)
+    if snapshot is not None:
+        _save_snapshot(cache_file_name, snapshot)
+
+    if queue_config.pop("enabled", False):
+        log_queue = LogQueue(**queue_config)
+        log_queue.start()
+
+
+def stop_loggers():
+    """Stops the logging queue (if there is one), once the records still on it have been handled.
+
+    This also runs when the app exits, before the logging system closes the handlers.
+    """
+    global log_queue
+
+    if log_queue is not None:
+        log_queue.stop()
+        log_queue = None
 
 
-inspect_logger_disabling()
+# registered after the logging module registered its own shutdown, so this runs before it
+atexit.register(stop_loggers)
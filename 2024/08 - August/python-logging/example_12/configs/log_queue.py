@@ -0,0 +1,130 @@
+"""Non-blocking logging, using a queue
+
+Instead of running handlers (writing to stdout, files, ...) in the thread that logs, every logger with handlers
+gets a single QueueHandler instead, which only puts the log record on a queue. A QueueListener thread takes
+records off that queue, and passes them on to the logger's original handlers.
+
+The queue is bounded, so a burst of logs cannot use up all the memory. When the queue is full, the policy
+decides what happens: `drop` discards the new record (and counts it), `block` waits for room in the queue
+(up to `block_timeout` seconds, if set, after which the record is dropped too).
+"""
+
+import copy
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+DROP = "drop"
+BLOCK = "block"
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Puts records on a bounded queue, along with the handlers that should handle them"""
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        handlers: list[logging.Handler],
+        policy: str = DROP,
+        block_timeout: float | None = None,
+    ):
+        if policy not in (DROP, BLOCK):
+            raise ValueError(f"Unknown queue policy: {policy}")
+        super().__init__(log_queue)
+        self.target_handlers = tuple(handlers)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped_count = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Unlike QueueHandler.prepare, we do not format the whole record here - the real handlers'
+        #   formatters will do that, in the listener thread. We only merge the message with its args now,
+        #   since the args could be changed by the app before the listener gets to the record.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if self.policy == BLOCK:
+                self.queue.put((self.target_handlers, record), timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait((self.target_handlers, record))
+        except queue.Full:
+            # not exact if several threads drop records at the same time, but close enough for reporting
+            self.dropped_count += 1
+
+
+class RoutingQueueListener(QueueListener):
+    """A QueueListener that passes each record on to the handlers it was queued with"""
+
+    def __init__(self, log_queue: queue.Queue, respect_handler_level: bool = True):
+        super().__init__(log_queue, respect_handler_level=respect_handler_level)
+
+    def enqueue_sentinel(self):
+        # QueueListener does not wait, which fails when the (bounded) queue is full - the listener thread is
+        #   still emptying it, so there will be room for the sentinel soon enough
+        self.queue.put(self._sentinel)
+
+    def handle(self, item: tuple[tuple[logging.Handler, ...], logging.LogRecord]):
+        handlers, record = item
+        for handler in handlers:
+            if not self.respect_handler_level or record.levelno >= handler.level:
+                handler.handle(record)
+
+
+class LogQueue:
+    """Moves the handlers of all configured loggers behind a bounded queue, and runs the listener thread"""
+
+    def __init__(
+        self, maxsize: int = 10_000, policy: str = DROP, block_timeout: float | None = None
+    ):
+        self.queue = queue.Queue(maxsize)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.listener = RoutingQueueListener(self.queue)
+        self.queue_handlers = []
+        self.running = False
+
+    def start(self):
+        for logger in _configured_loggers():
+            if not logger.handlers:
+                continue
+            queue_handler = BoundedQueueHandler(
+                self.queue, logger.handlers, self.policy, self.block_timeout
+            )
+            logger.handlers = [queue_handler]
+            self.queue_handlers.append((logger, queue_handler))
+        self.listener.start()
+        self.running = True
+
+    def stop(self):
+        """Handles the records still on the queue, and puts the original handlers back"""
+        if not self.running:
+            return
+        self.listener.stop()
+        self.running = False
+        dropped_count = self.dropped_count
+        for logger, queue_handler in self.queue_handlers:
+            logger.handlers = list(queue_handler.target_handlers)
+        self.queue_handlers.clear()
+
+        if dropped_count:
+            print(
+                f"Logging queue was full: {dropped_count} log records were dropped", file=sys.stderr
+            )
+
+    @property
+    def dropped_count(self) -> int:
+        return sum(queue_handler.dropped_count for _, queue_handler in self.queue_handlers)
+
+
+def _configured_loggers() -> list[logging.Logger]:
+    loggers = [logging.getLogger()]
+    for logger in logging.Logger.manager.loggerDict.values():
+        # the dict also holds placeholders, for the parents of loggers that were never created themselves
+        if isinstance(logger, logging.Logger):
+            loggers.append(logger)
+    return loggers
@@ -2,6 +2,13 @@ import json
 import logging
 from datetime import UTC, datetime
 
+from configs.structured_logging import resolve
+
+# attributes every log record has - anything else was added with `extra`
+STANDARD_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", logging.NOTSET, "", 0, "", (), None).__dict__
+) | {"message", "asctime", "taskName"}
+
 
 def serialize_local_timestamp(t: float) -> str | None:
     dt = datetime.fromtimestamp(t, UTC)
@@ -22,5 +29,13 @@ class JSONFormatter(logging.Formatter):
             "funcName": record.funcName,
             "exceptionInfo": record.exc_info,
         }
+        # lazy extras (see configs/structured_logging.py) are only evaluated here
+        extra = {
+            key: resolve(value)
+            for key, value in record.__dict__.items()
+            if key not in STANDARD_RECORD_ATTRIBUTES
+        }
+        if extra:
+            log_dict["extra"] = extra
 
-        return json.dumps(log_dict)
+        return json.dumps(log_dict, default=str)
@@ -0,0 +1,135 @@
+"""Custom handlers"""
+
+import gzip
+import logging
+import os
+import shutil
+import threading
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging.handlers import RotatingFileHandler
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """A file handler that writes records in batches, instead of one at a time.
+
+    FileHandler (and RotatingFileHandler) write and flush every single record. This handler keeps formatted
+    records in memory, and writes them with a single write() call (a "group commit") when:
+      - `bufferSize` characters of records have accumulated, or
+      - a record of level `flushLevel` or higher is handled (ERROR by default, so errors are never held back), or
+      - `flushInterval` seconds have passed (checked by a background thread), or
+      - the handler is closed (which the logging system does on exit).
+    With `fsync`, each batch is also synced to disk - once per batch, rather than once per record.
+
+    As with RotatingFileHandler, the file is rotated when it would grow past `maxBytes` (0 means never),
+    keeping `backupCount` old files. With `compress`, old files are gzipped (as app.log.1.gz, app.log.2.gz, ...)
+    in a background thread, so logging does not wait for the compression.
+    """
+
+    def __init__(
+        self,
+        filename,
+        mode="a",
+        maxBytes=0,
+        backupCount=0,
+        encoding=None,
+        delay=False,
+        errors=None,
+        bufferSize=64 * 1024,
+        flushInterval=1.0,
+        flushLevel=logging.ERROR,
+        fsync=False,
+        compress=False,
+    ):
+        super().__init__(filename, mode, maxBytes, backupCount, encoding, delay, errors)
+        self.bufferSize = bufferSize
+        self.flushInterval = flushInterval
+        # the level can be given by name in configs
+        self.flushLevel = (
+            flushLevel if isinstance(flushLevel, int) else logging.getLevelName(flushLevel)
+        )
+        self.fsync = fsync
+        self._buffer = []
+        self._buffered_size = 0
+
+        self._compressor = None
+        self._compression: Future | None = None
+        if compress:
+            self.namer = lambda name: f"{name}.gz"
+            self.rotator = self._rotate_and_compress
+            self._compressor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="log-compressor"
+            )
+
+        self._closing = threading.Event()
+        self._flusher = None
+        if flushInterval:
+            self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flusher.start()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            message = self.format(record) + self.terminator
+            self._buffer.append(message)
+            self._buffered_size += len(message)
+            if self._buffered_size >= self.bufferSize or record.levelno >= self.flushLevel:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        with self.lock:
+            if not self._buffer:
+                return
+            data = "".join(self._buffer)
+            self._buffer.clear()
+            self._buffered_size = 0
+
+            if self.stream is None:
+                self.stream = self._open()
+            size = self.stream.tell()
+            if self.maxBytes and size and size + len(data) > self.maxBytes:
+                self.doRollover()
+            self.stream.write(data)
+            self.stream.flush()
+            if self.fsync:
+                os.fsync(self.stream.fileno())
+
+    def close(self):
+        self._closing.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        try:
+            self.flush()
+        finally:
+            super().close()
+            if self._compressor is not None:
+                self._compressor.shutdown(wait=True)
+
+    def doRollover(self):
+        # old files can only be renamed once the previous one is compressed
+        if self._compression is not None:
+            self._compression.result()
+        super().doRollover()
+
+    def _flush_periodically(self):
+        while not self._closing.wait(self.flushInterval):
+            try:
+                self.flush()
+            except Exception:
+                if logging.raiseExceptions:
+                    traceback.print_exc()
+
+    def _rotate_and_compress(self, source: str, dest: str):
+        # renaming is all that is done in the logging thread, the compression happens in the background
+        pending = f"{source}.rotated"
+        os.rename(source, pending)
+        self._compression = self._compressor.submit(_gzip_file, pending, dest)
+
+
+def _gzip_file(source: str, dest: str):
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
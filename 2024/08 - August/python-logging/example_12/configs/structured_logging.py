@@ -0,0 +1,77 @@
+"""Structured logging, with lazily evaluated extras
+
+With a plain logger, everything passed to a logging call is computed before the logger decides whether the
+record is going to be logged at all:
+
+    logger.debug("Query results", extra={"rows": expensive_summary(rows)})
+
+calls `expensive_summary` even when DEBUG is disabled. With StructuredLoggerAdapter, extras can be wrapped with
+`lazy` instead, and they are only evaluated when a formatter uses them - never for records that are not
+logged (any other value, including callables, is logged as is):
+
+    logger = StructuredLoggerAdapter(logging.getLogger(__name__))
+    logger.debug("Query results", extra={"rows": lazy(expensive_summary, rows)})
+
+Note that, with the logging queue enabled (see log_queue.py), formatters run in the queue listener thread, a bit
+later - lazy values should not depend on data the app may change in the meantime.
+"""
+
+import logging
+from typing import Any, Callable
+
+_NOT_EVALUATED = object()
+
+
+class LazyValue:
+    """A value that is only computed (once) when it is first used"""
+
+    __slots__ = ("func", "args", "_value")
+
+    def __init__(self, func: Callable[..., Any], *args):
+        self.func = func
+        self.args = args
+        self._value = _NOT_EVALUATED
+
+    @property
+    def value(self) -> Any:
+        if self._value is _NOT_EVALUATED:
+            self._value = self.func(*self.args)
+        return self._value
+
+    # so that format strings such as "{asctime} - {message} - {rows}" evaluate the value too
+    def __str__(self):
+        return str(self.value)
+
+    def __repr__(self):
+        return repr(self.value)
+
+    def __format__(self, format_spec: str):
+        return format(self.value, format_spec)
+
+
+def lazy(func: Callable[..., Any], *args) -> LazyValue:
+    """A value computed as func(*args), when (and if) a formatter uses it"""
+    return LazyValue(func, *args)
+
+
+def resolve(value: Any) -> Any:
+    """The value of a lazy value - other values are returned as is"""
+    return value.value if isinstance(value, LazyValue) else value
+
+
+class StructuredLoggerAdapter(logging.LoggerAdapter):
+    """A logger adapter that adds `extra` fields to every record, along with the extras of each call.
+
+    Like any LoggerAdapter, it checks `isEnabledFor` before doing anything else, so a disabled level costs
+    a single check. Unlike LoggerAdapter, the fields passed in a call's `extra` are merged with the adapter's
+    own, instead of replacing them.
+    """
+
+    def __init__(self, logger: logging.Logger, extra: dict[str, Any] | None = None):
+        super().__init__(logger, extra or {})
+
+    def process(self, msg, kwargs):
+        extra = kwargs.get("extra")
+        # lazy values are passed on as they are - formatters evaluate them
+        kwargs["extra"] = {**self.extra, **extra} if extra else self.extra
+        return msg, kwargs
@@ -25,6 +25,12 @@ So, the moral of the story is that you need to make sure you do not run getLogge
 the logging system, or just set disable_existing_loggers to False.
 
 Here I chose to set disable_existing_loggers to False.
+
+To see which loggers the configuration disables, configure_loggers can be run in debug mode - try it with
+disable_existing_loggers set to True.
+
+The config is only parsed from YAML the first time: after that, it is loaded from a JSON snapshot (in __pycache__),
+until the YAML file changes (see configs/log_config.py).
 """
 
 import logging
@@ -36,7 +42,7 @@ from utils import formatters
 
 if __name__ == "__main__":
     print("*** Running log configuration...")
-    log_config.configure_loggers()
+    log_config.configure_loggers(debug=True)
 
     # Logging to my_app logger
     # Create the logger here is fine, not only is it created after configuration has happened, but it is also
@@ -0,0 +1,61 @@
+"""Logging from the workers of a multiprocessing pool
+
+The workers (and the main process) send their records to a single aggregator process, which runs the handlers
+configured in logger_config.yaml (see configs/log_aggregator.py).
+
+Run it from this directory: python pool_logging.py
+"""
+
+import logging
+import os
+import time
+from multiprocessing import Pool
+
+from configs import log_config
+from configs.log_aggregator import LogAggregator
+
+JOB_COUNT = 40
+RECORDS_PER_JOB = 2_500
+
+
+def run_job(job_id: int) -> int:
+    logger = logging.getLogger("my_app.jobs")
+    for i in range(RECORDS_PER_JOB):
+        logger.debug("Job %s: processing item %s", job_id, i, extra={"pid": os.getpid()})
+    logger.info("Job %s done", job_id)
+    return RECORDS_PER_JOB
+
+
+def main():
+    config = log_config.load_config()
+    config.pop("queue", None)  # the aggregator process already keeps logging out of the way
+    # the jobs' debug records go to a file, rather than flooding the console
+    config["handlers"]["jobs_handler"] = {
+        "class": "configs.logger_handlers.BufferedRotatingFileHandler",
+        "formatter": "simple",
+        "filename": "logs/jobs.log",
+        "mode": "w",
+    }
+    config["loggers"]["my_app.jobs"] = {
+        "level": "DEBUG",
+        "handlers": ["jobs_handler"],
+        "propagate": False,
+    }
+
+    aggregator = LogAggregator(config)
+    aggregator.start()
+    logger = logging.getLogger("my_app")
+
+    start = time.perf_counter()
+    pool = Pool(processes=os.cpu_count(), **aggregator.pool_initializer())
+    record_count = sum(pool.map(run_job, range(JOB_COUNT)))
+    pool.close()
+    pool.join()
+    elapsed = time.perf_counter() - start
+    logger.info("Logged %s records from %s jobs in %.2fs", record_count, JOB_COUNT, elapsed)
+
+    aggregator.stop()
+
+
+if __name__ == "__main__":
+    main()
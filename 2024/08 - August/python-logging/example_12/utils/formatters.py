@@ -1,13 +1,14 @@
 import logging
 from datetime import datetime
 
+from configs.structured_logging import StructuredLoggerAdapter, lazy
 from utils.loggers import inspect_logger
 
-logger = logging.getLogger("utils")
+logger = StructuredLoggerAdapter(logging.getLogger("utils"))
 inspect_logger("utils")
 
 
 def format_date_standard(dt: datetime) -> str:
     inspect_logger("utils")
-    logger.info("Formatting datetime", extra={"datetime": dt})
+    logger.info("Formatting datetime", extra={"datetime": lazy(dt.isoformat)})
     return dt.strftime("%Y-%m-%d %H:%M:%S")
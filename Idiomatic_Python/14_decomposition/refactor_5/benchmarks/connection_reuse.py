@@ -0,0 +1,60 @@
+"""Benchmark: module level `requests.get` vs a pooled `SwapiClient`
+
+Run from the `refactor_5` folder:
+
+    python -m benchmarks.connection_reuse
+
+The stand-in server runs plain HTTP on localhost, so this only measures the TCP
+connection setup that is saved - against the real (TLS) API every new connection
+also pays for a TLS handshake, and the gains are correspondingly larger.
+"""
+import contextlib
+import io
+import time
+
+import requests
+
+from benchmarks.standin_server import start_server
+from services.swapi.client import SwapiClient
+
+QUERIES = 200
+
+
+def one_connection_per_query(urls):
+    for url in urls:
+        response = requests.get(url, headers={"Content-Type": "application/json"})
+        response.raise_for_status()
+        response.json()
+
+
+def pooled_client(urls, base_url):
+    with SwapiClient(base_url) as client:
+        for url in urls:
+            client.get_json(url)
+
+
+def run(label, server, func, *args):
+    server.connections = server.requests = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+    print(
+        f"{label:<28} {elapsed * 1_000:8.1f} ms  "
+        f"{elapsed / server.requests * 1_000_000:8.1f} us/query  "
+        f"{server.connections:4} connections"
+    )
+
+
+def main():
+    server, base_url = start_server()
+    urls = [f"{base_url}/films/{n % 6 + 1}/" for n in range(QUERIES)]
+
+    print(f"{QUERIES} queries against {base_url}")
+    run("requests.get per query", server, one_connection_per_query, urls)
+    run("SwapiClient (pooled)", server, pooled_client, urls, base_url)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""A local stand-in for SWAPI, used for benchmarking
+
+Serves paged starships and films in the same shape as SWAPI, with an optional
+artificial latency, and counts how many connections clients open.
+"""
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+STARSHIP_COUNT = 36
+PAGE_SIZE = 10
+FILM_COUNT = 6
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        with self.server.stats_lock:
+            self.server.requests += 1
+        time.sleep(self.server.latency)
+
+        url = urlsplit(self.path)
+        base_url = f"http://{self.headers['Host']}/api"
+        parts = [part for part in url.path.split("/") if part]
+        page_number = int(parse_qs(url.query).get("page", ["1"])[0])
+        if parts == ["api"]:
+            body = {"films": f"{base_url}/films/", "starships": f"{base_url}/starships/"}
+        elif parts[1:] == ["starships"]:
+            body = starships_page(base_url, page_number)
+        elif parts[1:] == ["films"]:
+            body = films_page(base_url, page_number)
+        elif parts[1:2] == ["films"] and len(parts) == 3:
+            body = film(base_url, int(parts[2]))
+        else:
+            self.send_error(404)
+            return
+
+        self.send_json(body)
+
+    def send_json(self, body):
+        content = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            content = gzip.compress(content)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def starship(base_url, number):
+    return {
+        "name": f"Starship {number}",
+        "cargo_capacity": str(number * 1_000) if number % 4 else "unknown",
+        "films": [f"{base_url}/films/{number % FILM_COUNT + 1}/"],
+        "url": f"{base_url}/starships/{number}/",
+    }
+
+
+def starships_page(base_url, page_number):
+    first = (page_number - 1) * PAGE_SIZE + 1
+    last = min(page_number * PAGE_SIZE, STARSHIP_COUNT)
+    has_next = last < STARSHIP_COUNT
+    return {
+        "count": STARSHIP_COUNT,
+        "next": f"{base_url}/starships/?page={page_number + 1}" if has_next else None,
+        "results": [starship(base_url, number) for number in range(first, last + 1)],
+    }
+
+
+def film(base_url, number):
+    return {"title": f"Film {number}", "url": f"{base_url}/films/{number}/"}
+
+
+def films_page(base_url, page_number):
+    films = [film(base_url, number) for number in range(1, FILM_COUNT + 1)]
+    return {"count": FILM_COUNT, "next": None, "results": films if page_number == 1 else []}
+
+
+def start_server(latency=0.0):
+    """
+    Starts the stand-in server on a background thread.
+
+    :param latency: artificial delay (seconds) added to every response
+    :return: the server, and the base url to use for the API
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.stats_lock = threading.Lock()
+    server.connections = 0
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}/api"
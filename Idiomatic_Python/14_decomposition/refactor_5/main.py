@@ -1,17 +1,24 @@
 """App to demo SWAPI Usage"""
 from services.swapi import api as swapi
-from utils import extract_film_urls, filter_ships_by_capacity
+from utils import film_urls, has_min_capacity
 
 
 def main(min_capacity):
-    ships = swapi.all_starships()
-    filtered_ships = filter_ships_by_capacity(ships, min_capacity)
-    film_urls = set(extract_film_urls(filtered_ships))
-    return sorted(swapi.film_titles(film_urls))
+    # we need every starship, so fetch all the pages at once
+    unique_film_urls = (
+        swapi.starships_query(concurrent=True)
+        .where(lambda ship: has_min_capacity(ship, min_capacity))
+        .flat_map(film_urls)
+        .distinct()
+    )
+    return sorted(swapi.film_titles(unique_film_urls))
 
 
 if __name__ == '__main__':
     titles = main(1_000)
     print("=" * 50)
     for title in titles:
-        print(title)
\ No newline at end of file
+        print(title)
+    if swapi.client.cache is not None:
+        print("=" * 50)
+        print(swapi.client.cache.stats)
@@ -0,0 +1,33 @@
+"""Crawls all of SWAPI into a local snapshot
+
+Usage:
+
+    python mirror.py swapi.sqlite3
+    SWAPI_SNAPSHOT_PATH=swapi.sqlite3 python main.py
+"""
+import argparse
+import time
+
+from services.swapi import api as swapi
+from services.swapi.mirror import Snapshot, crawl
+
+
+def main(snapshot_path):
+    snapshot = Snapshot(snapshot_path)
+    try:
+        return crawl(swapi.client, snapshot)
+    finally:
+        snapshot.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("snapshot_path", help="path of the SQLite snapshot to write")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = main(args.snapshot_path)
+    print("=" * 50)
+    for kind, count in sorted(counts.items()):
+        print(f"{kind}: {count}")
+    print(f"crawled in {time.perf_counter() - start:.2f} s")
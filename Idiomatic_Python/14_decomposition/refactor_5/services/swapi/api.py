@@ -2,17 +2,66 @@
 
 Used for querying the SWAPI API.
 """
-import requests
-from requests.exceptions import Timeout, RequestException
+import os
 
-from services.swapi.paging import paged
-from services.swapi.retries import timeout_retry
+from services.swapi.cache import DiskStore, ResponseCache
+from services.swapi.client import SwapiClient
+from services.swapi.mirror import Snapshot, SnapshotClient
+from services.swapi.ratelimit import TokenBucket
+from services.swapi.retries import RetryBudget, RetryPolicy
 
 
 BASE_URL = "https://swapi.dev/api"
 MAX_ATTEMPTS = 5
 INITIAL_TIMEOUT = 1  # seconds
+DEADLINE = 60  # seconds, for a single query across all its attempts
+MAX_WORKERS = 8
+RATE_LIMIT = 10  # requests per second
+RATE_LIMIT_BURST = MAX_WORKERS
+CACHE_TTL = 24 * 60 * 60  # seconds
+# responses are only cached in memory, unless SWAPI_CACHE_PATH is set to a SQLite file
+#   (e.g. ~/.cache/swapi/responses.sqlite3) to keep them between runs
+CACHE_PATH = os.environ.get("SWAPI_CACHE_PATH")
+# set SWAPI_SNAPSHOT_PATH to serve everything from a snapshot created by `mirror.py`
+SNAPSHOT_PATH = os.environ.get("SWAPI_SNAPSHOT_PATH")
+
+client = SwapiClient(
+    BASE_URL,
+    retry_policy=RetryPolicy(
+        max_attempts=MAX_ATTEMPTS,
+        initial_timeout=INITIAL_TIMEOUT,
+        deadline=DEADLINE,
+        budget=RetryBudget(),
+    ),
+    rate_limiter=TokenBucket(RATE_LIMIT, burst=RATE_LIMIT_BURST),
+    max_workers=MAX_WORKERS,
+    cache=ResponseCache(ttl=CACHE_TTL, store=DiskStore(CACHE_PATH) if CACHE_PATH else None),
+)
+
+
+def use_snapshot(snapshot_path):
+    """
+    Serves all queries from a local snapshot instead of the live API
+
+    :param snapshot_path: path to a snapshot created by `mirror.py`
+    """
+    global client
+    client.close()
+    client = SnapshotClient(Snapshot(snapshot_path), BASE_URL, max_workers=MAX_WORKERS)
+
 
+if SNAPSHOT_PATH:
+    use_snapshot(SNAPSHOT_PATH)
+
+
+def starships_page(request_url):
+    """
+    Returns a single raw page of starships
+
+    :param request_url: the url to query
+    :return: the page as returned by SWAPI (total `count`, `next` page url and `results`)
+    """
+    return client.starships_page(request_url)
 
 
 def starships(request_url, *, timeout=None):
@@ -23,20 +72,7 @@ def starships(request_url, *, timeout=None):
     :param timeout: timeout for request query
     :return: list of starships, and the URL for the next page (if any)
     """
-    print(f"running query: {request_url}")
-
-    retry_get = timeout_retry(max_attempts=MAX_ATTEMPTS, initial_timeout=INITIAL_TIMEOUT)(requests.get)
-    response = retry_get(
-        request_url,
-        headers={"Content-Type": "application/json"}
-    )
-    response.raise_for_status()
-
-    data = response.json()
-    results = data.get("results", [])
-    next_page = data.get("next", None)
-
-    return results, next_page
+    return client.starships(request_url, timeout=timeout)
 
 
 def all_starships():
@@ -44,7 +80,29 @@ def all_starships():
     Retrieves a list of all starships from SWAPI.
     :return: a generator of all starships
     """
-    yield from paged(starships, f"{BASE_URL}/starships")
+    yield from client.all_starships()
+
+
+def starships_query(*, concurrent=False):
+    """
+    Starts a lazily evaluated query over all starships.
+
+    :param concurrent: if True, fetch all pages concurrently instead of one at a time
+        (with the next page prefetched)
+    :return: a `Query` of starships
+    """
+    return client.starships_query(concurrent=concurrent)
+
+
+def starships_with_min_capacity(min_capacity):
+    """
+    Starts a query over the starships with some minimum capacity (indexed, when served
+    from a snapshot).
+
+    :param min_capacity: the minimum capacity (inclusive) of each ship
+    :return: a `Query` of starships
+    """
+    return client.starships_with_min_capacity(min_capacity)
 
 
 def film_title(film_url):
@@ -53,23 +111,25 @@ def film_title(film_url):
     :param film_url: url to query
     :return: a string title (or None if title is missing)
     """
-    print(f"running query: {film_url}")
+    return client.film_title(film_url)
 
-    retry_get = timeout_retry(max_attempts=MAX_ATTEMPTS, initial_timeout=INITIAL_TIMEOUT)(requests.get)
-    response = retry_get(
-        film_url,
-        headers={"Content-Type": "application/json"}
-    )
-    response.raise_for_status()
-    data = response.json()
-    return data.get("title")
+
+def film_titles_by_url(film_urls):
+    """
+    Gets film titles for all the film urls passed to function, querying them concurrently
+    :param film_urls: an iterable of (potentially non-unique) film urls
+    :return: a dict mapping each unique film url to its title
+    """
+    return client.film_titles_by_url(film_urls)
 
 
 def film_titles(film_urls):
     """
-    Gets film titles for each film url passed to function
+    Gets film titles for each film url passed to function (duplicate urls are only
+    queried once, but still get a title each)
     :param film_urls: a list of film urls
-    :return: a generator of titles
+    :return: a generator of titles, one per film url, in the same order
     """
-    for film_url in film_urls:
-        yield film_title(film_url)
+    film_urls = list(film_urls)
+    titles_by_url = film_titles_by_url(film_urls)
+    yield from (titles_by_url[film_url] for film_url in film_urls)
@@ -0,0 +1,69 @@
+"""Utilities to resolve many urls concurrently"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class BulkResolver:
+    """
+    Resolves urls concurrently, using some function that resolves a single url.
+
+    At most `max_concurrency` calls to the underlying function are running at any
+    given time (across all threads using this resolver), and concurrent requests for
+    the same url are merged into a single call - the other callers just wait for
+    the result of the call that is already in flight.
+    """
+
+    def __init__(self, resolve_func, *, max_concurrency=8):
+        """
+        :param resolve_func: a function that takes a single argument for the url to resolve
+        :param max_concurrency: maximum number of calls to `resolve_func` running at once
+        """
+        self.resolve_func = resolve_func
+        self.max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def __call__(self, url):
+        """
+        Resolves a single url, joining an in-flight request for the same url if there is one.
+
+        :param url: the url to resolve
+        :return: whatever `resolve_func` returns for that url
+        """
+        with self._lock:
+            future = self._in_flight.get(url)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._in_flight[url] = future
+
+        if not is_owner:
+            return future.result()
+
+        try:
+            with self._semaphore:
+                result = self.resolve_func(url)
+        except Exception as ex:
+            future.set_exception(ex)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[url]
+
+    def resolve_all(self, urls):
+        """
+        Resolves a collection of urls concurrently.
+
+        :param urls: an iterable of (potentially non-unique) urls
+        :return: a dict mapping each unique url to its resolved value
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        if not unique_urls:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(len(unique_urls), self.max_concurrency)) as executor:
+            return dict(zip(unique_urls, executor.map(self, unique_urls)))
@@ -0,0 +1,191 @@
+"""Caching of API responses
+
+An in-memory LRU cache, optionally backed by an on-disk (SQLite) store so cached
+responses survive between runs. Entries older than the TTL are not thrown away,
+they are kept around so they can be revalidated with a conditional request
+(`ETag` / `Last-Modified`), which is much cheaper than downloading them again.
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+CacheEntry = namedtuple("CacheEntry", "data etag last_modified stored_at")
+
+
+class CacheStats:
+    """Thread-safe hit / miss counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    def record(self, outcome):
+        """
+        :param outcome: one of "hits", "revalidations" or "misses"
+        """
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def __str__(self):
+        return (
+            f"cache hits: {self.hits}, revalidated: {self.revalidations}, "
+            f"misses: {self.misses}"
+        )
+
+
+class LRUCache:
+    """A thread-safe, size bounded, least recently used cache"""
+
+    def __init__(self, max_size=1_024):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+class DiskStore:
+    """
+    Stores cache entries in a SQLite database, one row per url
+
+    The database (and its directory) is only created when the store is first used.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        # called with the lock held
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, "
+                    "data TEXT, etag TEXT, last_modified TEXT, stored_at REAL)"
+                )
+        return self._connection
+
+    def get(self, key):
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT data, etag, last_modified, stored_at FROM responses WHERE url = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        data, etag, last_modified, stored_at = row
+        return CacheEntry(json.loads(data), etag, last_modified, stored_at)
+
+    def put(self, key, entry):
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                    (key, json.dumps(entry.data), entry.etag, entry.last_modified, entry.stored_at),
+                )
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class ResponseCache:
+    """
+    Two level response cache: an in-memory LRU in front of an optional disk store.
+    """
+
+    def __init__(self, *, ttl=24 * 60 * 60, max_size=1_024, store=None):
+        """
+        :param ttl: number of seconds a cached response is used without revalidating it
+        :param max_size: maximum number of responses kept in memory
+        :param store: optional persistent store (e.g. `DiskStore`)
+        """
+        self.ttl = ttl
+        self.memory = LRUCache(max_size)
+        self.store = store
+        self.stats = CacheStats()
+
+    def get(self, url):
+        """
+        Looks up a cached response, fresh or stale
+
+        :param url: the url that was queried
+        :return: a `CacheEntry`, or None if nothing is cached for that url
+        """
+        entry = self.memory.get(url)
+        if entry is None and self.store is not None:
+            entry = self.store.get(url)
+            if entry is not None:
+                self.memory.put(url, entry)
+        return entry
+
+    def put(self, url, data, etag=None, last_modified=None):
+        """
+        Caches a response
+
+        :param url: the url that was queried
+        :param data: the decoded JSON response
+        :param etag: the response's `ETag` header, if any
+        :param last_modified: the response's `Last-Modified` header, if any
+        :return: the new `CacheEntry`
+        """
+        entry = CacheEntry(data, etag, last_modified, time.time())
+        self.memory.put(url, entry)
+        if self.store is not None:
+            self.store.put(url, entry)
+        return entry
+
+    def refresh(self, url, entry):
+        """
+        Marks a stale entry as fresh again (after a successful revalidation)
+
+        :param url: the url that was queried
+        :param entry: the revalidated `CacheEntry`
+        :return: the refreshed `CacheEntry`
+        """
+        return self.put(url, entry.data, entry.etag, entry.last_modified)
+
+    def is_fresh(self, entry):
+        return time.time() - entry.stored_at < self.ttl
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+
+
+def conditional_headers(entry):
+    """
+    Builds the headers used to revalidate a cached response
+
+    :param entry: the stale `CacheEntry`
+    :return: a dict of headers (empty if the entry cannot be revalidated)
+    """
+    headers = {}
+    if entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    return headers
@@ -0,0 +1,211 @@
+"""SWAPI Client
+
+Keeps a pool of persistent connections to SWAPI, shared by all queries.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+
+from services.swapi.bulk import BulkResolver
+from services.swapi.cache import conditional_headers
+from services.swapi.paging import concurrent_paged, pages, prefetched
+from services.swapi.query import Query
+from services.swapi.resources import cargo_capacity
+from services.swapi.retries import RetryPolicy, parse_retry_after
+
+
+class SwapiClient:
+    """
+    Client used for querying the SWAPI API.
+
+    All queries go through a single `requests.Session`, so TCP/TLS connections are
+    kept alive and reused between requests instead of being opened for every call.
+    """
+
+    def __init__(
+        self, base_url, *, retry_policy=None, rate_limiter=None, max_workers=8, cache=None
+    ):
+        """
+        :param base_url: the root url of the API
+        :param retry_policy: the `RetryPolicy` used for every query (a default policy is
+            used if not specified)
+        :param rate_limiter: optional `TokenBucket`, acquired before every request sent
+        :param max_workers: maximum number of queries running at the same time - the
+            connection pool is sized to match
+        :param cache: optional `ResponseCache` used to avoid re-downloading responses
+        """
+        self.base_url = base_url
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.max_workers = max_workers
+        self.session = self._make_session()
+        self._film_title_resolver = BulkResolver(self.film_title, max_concurrency=max_workers)
+
+    def _make_session(self):
+        session = requests.Session()
+        session.headers.update(
+            {
+                "Content-Type": "application/json",
+                "Accept-Encoding": "gzip, deflate",
+                "Connection": "keep-alive",
+            }
+        )
+        # retries are handled by the retry policy, and `pool_block` makes threads wait
+        # for a pooled connection rather than opening (and discarding) extra ones
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.max_workers,
+            pool_block=True,
+            max_retries=0,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self):
+        """Closes all pooled connections (and the cache's store, if any)"""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_json(self, request_url, *, timeout=None):
+        """
+        Queries a single url, retrying as the retry policy allows
+
+        If a cache is configured, fresh cached responses are returned without querying
+        the API at all, and stale ones are revalidated with a conditional request.
+
+        :param request_url: the url to query
+        :param timeout: timeout for each request attempt (by default, the retry policy's
+            timeouts are used)
+        :return: the decoded JSON response
+        """
+        if self.cache is None:
+            return self._get(request_url, timeout=timeout).json()
+
+        entry = self.cache.get(request_url)
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.stats.record("hits")
+            return entry.data
+
+        headers = conditional_headers(entry) if entry is not None else {}
+        response = self._get(request_url, headers=headers, timeout=timeout)
+        if response.status_code == 304:
+            self.cache.stats.record("revalidations")
+            return self.cache.refresh(request_url, entry).data
+
+        self.cache.stats.record("misses")
+        data = response.json()
+        self.cache.put(
+            request_url,
+            data,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return data
+
+    def _get(self, request_url, headers=None, timeout=None):
+        print(f"running query: {request_url}")
+
+        response = self.retry_policy.call(
+            self._send, request_url, headers=headers, request_timeout=timeout
+        )
+        response.raise_for_status()
+        return response
+
+    def _send(self, request_url, *, timeout, request_timeout=None, **kwargs):
+        # a single attempt - retried attempts each go through the rate limiter again
+        kwargs["timeout"] = timeout if request_timeout is None else request_timeout
+        if self.rate_limiter is None:
+            return self.session.get(request_url, **kwargs)
+
+        self.rate_limiter.acquire()
+        response = self.session.get(request_url, **kwargs)
+        if response.status_code == 429:
+            self.rate_limiter.throttled(parse_retry_after(response.headers.get("Retry-After")))
+        else:
+            self.rate_limiter.succeeded()
+        return response
+
+    def starships_page(self, request_url, *, timeout=None):
+        """
+        Returns a single raw page of starships
+
+        :param request_url: the url to query
+        :param timeout: timeout for request query
+        :return: the page as returned by SWAPI (total `count`, `next` page url and `results`)
+        """
+        return self.get_json(request_url, timeout=timeout)
+
+    def starships(self, request_url, *, timeout=None):
+        """
+        Returns a single page's worth of starships
+
+        :param request_url: the url to query
+        :param timeout: timeout for request query
+        :return: list of starships, and the URL for the next page (if any)
+        """
+        data = self.starships_page(request_url, timeout=timeout)
+        results = data.get("results", [])
+        next_page = data.get("next", None)
+
+        return results, next_page
+
+    def all_starships(self):
+        """
+        Retrieves a list of all starships from SWAPI.
+        :return: a generator of all starships
+        """
+        yield from concurrent_paged(
+            self.starships_page, f"{self.base_url}/starships", max_workers=self.max_workers
+        )
+
+    def starships_query(self, *, concurrent=False):
+        """
+        Starts a lazily evaluated query over all starships.
+
+        :param concurrent: if True, all pages are fetched concurrently as soon as the query
+            is iterated (best when the whole collection is needed), otherwise pages are
+            fetched one at a time, the next page being prefetched while the current one is
+            processed (best for selective queries that stop early)
+        :return: a `Query` of starships
+        """
+        if concurrent:
+            return Query(self.all_starships)
+        return Query.from_pages(
+            lambda: prefetched(pages(self.starships_page, f"{self.base_url}/starships"))
+        )
+
+    def starships_with_min_capacity(self, min_capacity):
+        """
+        Starts a query over the starships with some minimum capacity.
+
+        :param min_capacity: the minimum capacity (inclusive) of each ship
+        :return: a `Query` of starships
+        """
+        return self.starships_query(concurrent=True).where(
+            lambda ship: (cargo_capacity(ship) or 0) >= min_capacity
+        )
+
+    def film_title(self, film_url):
+        """
+        Gets title for a specific film
+        :param film_url: url to query
+        :return: a string title (or None if title is missing)
+        """
+        data = self.get_json(film_url)
+        return data.get("title")
+
+    def film_titles_by_url(self, film_urls):
+        """
+        Gets film titles for all the film urls passed to function, querying them concurrently
+        :param film_urls: an iterable of (potentially non-unique) film urls
+        :return: a dict mapping each unique film url to its title
+        """
+        return self._film_title_resolver.resolve_all(film_urls)
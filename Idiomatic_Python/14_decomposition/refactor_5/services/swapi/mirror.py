@@ -0,0 +1,201 @@
+"""Offline SWAPI mirror
+
+Crawls every SWAPI resource once into a local SQLite snapshot, which can then be
+served instead of the live API - see `SnapshotClient`.
+"""
+import json
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from services.swapi.client import SwapiClient
+from services.swapi.paging import concurrent_paged, page_url
+from services.swapi.query import Query
+from services.swapi.resources import cargo_capacity, resource_id, resource_key, resource_kind
+
+PAGE_SIZE = 10
+
+
+class Snapshot:
+    """
+    A local SQLite snapshot of SWAPI resources.
+
+    Resources are stored as JSON, keyed by url, along with their kind and (for
+    starships and vehicles) their cargo capacity, which are both indexed.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection:
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS resources (
+                    url TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    cargo_capacity INTEGER,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS resources_kind ON resources (kind);
+                CREATE INDEX IF NOT EXISTS resources_cargo_capacity
+                    ON resources (kind, cargo_capacity);
+                """
+            )
+
+    def close(self):
+        self._connection.close()
+
+    def write(self, kind, resources):
+        """
+        Stores (or replaces) resources of a given kind
+
+        :param kind: the kind of resources, e.g. "starships"
+        :param resources: an iterable of resources
+        """
+        rows = (
+            (resource_key(resource["url"]), kind, cargo_capacity(resource), json.dumps(resource))
+            for resource in resources
+        )
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?)", rows
+            )
+
+    def get(self, url):
+        """
+        :param url: the url of a single resource
+        :return: the resource, or None if it is not in the snapshot
+        """
+        row = self._fetchone("SELECT data FROM resources WHERE url = ?", resource_key(url))
+        return json.loads(row[0]) if row else None
+
+    def kinds(self):
+        """
+        :return: a list of the kinds of resources in the snapshot
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT DISTINCT kind FROM resources").fetchall()
+        return [kind for kind, in rows]
+
+    def count(self, kind):
+        return self._fetchone("SELECT COUNT(*) FROM resources WHERE kind = ?", kind)[0]
+
+    def page(self, kind, page_number, page_size=PAGE_SIZE):
+        """
+        :return: a list of resources of the requested kind, for a single page
+        """
+        return self._fetchall(
+            "SELECT data FROM resources WHERE kind = ? ORDER BY rowid LIMIT ? OFFSET ?",
+            kind,
+            page_size,
+            (page_number - 1) * page_size,
+        )
+
+    def with_min_cargo_capacity(self, kind, min_capacity):
+        """
+        :return: a list of resources of the requested kind, with a cargo capacity of at
+            least `min_capacity` (looked up using the index)
+        """
+        return self._fetchall(
+            "SELECT data FROM resources WHERE kind = ? AND cargo_capacity >= ? ORDER BY rowid",
+            kind,
+            min_capacity,
+        )
+
+    def _fetchone(self, sql, *params):
+        with self._lock:
+            return self._connection.execute(sql, params).fetchone()
+
+    def _fetchall(self, sql, *params):
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return [json.loads(data) for data, in rows]
+
+
+def crawl(client, snapshot):
+    """
+    Crawls every SWAPI resource into a snapshot.
+
+    Every kind of resource is crawled at the same time, and the pages of each kind are
+    fetched concurrently as well.
+
+    :param client: the `SwapiClient` used to query the live API
+    :param snapshot: the `Snapshot` to write to
+    :return: a dict with the number of resources crawled, for each kind
+    """
+    resource_urls = client.get_json(f"{client.base_url}/")
+
+    def crawl_kind(kind):
+        resources = list(concurrent_paged(client.get_json, resource_urls[kind]))
+        snapshot.write(kind, resources)
+        return len(resources)
+
+    with ThreadPoolExecutor(max_workers=len(resource_urls)) as executor:
+        futures = {executor.submit(crawl_kind, kind): kind for kind in resource_urls}
+        return {futures[future]: future.result() for future in as_completed(futures)}
+
+
+class SnapshotClient(SwapiClient):
+    """
+    Serves SWAPI queries from a local snapshot instead of the live API.
+
+    Paged urls (e.g. `.../starships/?page=2`) are served with the same shape as
+    SWAPI pages, so everything built on top of `SwapiClient` works unchanged.
+    """
+
+    def __init__(self, snapshot, base_url, *, max_workers=8):
+        super().__init__(base_url, max_workers=max_workers)
+        self.snapshot = snapshot
+
+    def close(self):
+        super().close()
+        self.snapshot.close()
+
+    def get_json(self, request_url, *, timeout=None):
+        """
+        Looks up a single url in the snapshot
+
+        :param request_url: the url to look up - a single resource, a (page of a) list of
+            resources, or the API root
+        :param timeout: unused - nothing is queried
+        :return: the same JSON the live API would return
+        """
+        data = self.snapshot.get(request_url)
+        if data is not None:
+            return data
+        # only lists of resources (and the root) are built from the snapshot
+        if resource_id(request_url, self.base_url) is not None:
+            raise LookupError(f"{request_url} is not in the snapshot")
+
+        kind = resource_kind(request_url, self.base_url)
+        if not kind:
+            root_url = resource_key(self.base_url)
+            return {kind: f"{root_url}/{kind}/" for kind in self.snapshot.kinds()}
+
+        page_number = int(parse_qs(urlsplit(request_url).query).get("page", ["1"])[0])
+        return self._page(request_url, kind, page_number)
+
+    def _page(self, request_url, kind, page_number):
+        count = self.snapshot.count(kind)
+        if not count:
+            raise LookupError(f"{request_url} is not in the snapshot")
+        has_next = page_number * PAGE_SIZE < count
+        return {
+            "count": count,
+            "next": page_url(request_url, page_number + 1) if has_next else None,
+            "previous": page_url(request_url, page_number - 1) if page_number > 1 else None,
+            "results": self.snapshot.page(kind, page_number),
+        }
+
+    def starships_with_min_capacity(self, min_capacity):
+        """
+        Starts a query over the starships with some minimum capacity, using the index.
+
+        :param min_capacity: the minimum capacity (inclusive) of each ship
+        :return: a `Query` of starships
+        """
+        return Query(lambda: self.snapshot.with_min_cargo_capacity("starships", min_capacity))
@@ -1,4 +1,9 @@
 """Utilities to implement api paging"""
+import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
+
+
 def paged(single_page_func, initial_request_url):
     """
     Used to paginate API requests.
@@ -12,3 +17,100 @@ def paged(single_page_func, initial_request_url):
     while next_request_url:
         results, next_request_url = single_page_func(next_request_url)
         yield from results
+
+
+def pages(page_func, initial_request_url):
+    """
+    Used to paginate API requests, one raw page at a time.
+
+    Pages are only requested as the caller iterates, so a caller that stops early
+    does not pay for pages it never reads.
+
+    :param page_func: a function that takes a single argument for the url to query, and
+        returns the raw page (a dict with `next` and `results` keys)
+    :param initial_request_url: the initial starting page
+    :return: a generator of raw pages
+    """
+    next_request_url = initial_request_url
+    while next_request_url:
+        page = page_func(next_request_url)
+        next_request_url = page.get("next")
+        yield page
+
+
+def prefetched(iterable):
+    """
+    Fetches the next item of an iterable in the background, while the current one is used.
+
+    :param iterable: an iterable whose items are slow to produce (e.g. pages from `pages`)
+    :return: a generator of the same items
+    """
+    iterator = iter(iterable)
+    done = object()
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        future = executor.submit(next, iterator, done)
+        while (item := future.result()) is not done:
+            future = executor.submit(next, iterator, done)
+            yield item
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def page_url(request_url, page_number):
+    """
+    Builds the url for a specific page of a paged resource.
+
+    :param request_url: the url of the paged resource (may already contain a query string)
+    :param page_number: the (1-based) page number
+    :return: the url for the requested page
+    """
+    scheme, netloc, path, query, fragment = urlsplit(request_url)
+    params = parse_qs(query)
+    params["page"] = [str(page_number)]
+    return urlunsplit((scheme, netloc, path, urlencode(params, doseq=True), fragment))
+
+
+def page_urls(first_page, initial_request_url):
+    """
+    Computes the urls of all the pages that follow the first one.
+
+    :param first_page: the raw first page, containing the total `count` and its `results`
+    :param initial_request_url: the url that was used to fetch the first page
+    :return: a list of urls, one for each remaining page
+    """
+    page_size = len(first_page.get("results", []))
+    if not first_page.get("next") or not page_size:
+        return []
+    page_count = math.ceil(first_page.get("count", 0) / page_size)
+    return [page_url(initial_request_url, page_number) for page_number in range(2, page_count + 1)]
+
+
+def concurrent_paged(page_func, initial_request_url, *, max_workers=8, ordered=True):
+    """
+    Used to paginate API requests, fetching all pages after the first one concurrently.
+
+    Instead of following the `next` links one page at a time, the first page is used to
+    find out how many pages there are, and the remaining pages are then all requested
+    at the same time.
+
+    :param page_func: a function that takes a single argument for the url to query, and
+        returns the raw page (a dict with `count`, `next` and `results` keys)
+    :param initial_request_url: the initial starting page
+    :param max_workers: maximum number of pages that are fetched at the same time
+    :param ordered: if True results are yielded in page order, otherwise pages are yielded
+        as soon as they complete
+    :return: a generator of results from all requested pages
+    """
+    first_page = page_func(initial_request_url)
+    remaining_urls = page_urls(first_page, initial_request_url)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [executor.submit(page_func, url) for url in remaining_urls]
+        yield from first_page.get("results", [])
+        for future in futures if ordered else as_completed(futures):
+            yield from future.result().get("results", [])
+    finally:
+        # if the caller stops iterating early, don't bother fetching pages nobody will read
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,84 @@
+"""A small, lazily evaluated query pipeline over SWAPI resources"""
+import itertools
+
+
+class Query:
+    """
+    Lazily evaluated query over some iterable source of resources.
+
+    Each step (`where`, `map`, `flat_map`, `distinct`, `limit`) returns a new query,
+    and nothing is fetched until the query is iterated. Items flow through the whole
+    pipeline one at a time, so a query that stops early (e.g. with `limit`) stops
+    pulling from the source - and, for paged sources, stops requesting pages.
+    """
+
+    def __init__(self, source):
+        """
+        :param source: a function that takes no arguments and returns an iterable - called
+            every time the query is iterated
+        """
+        self._source = source
+
+    @classmethod
+    def from_pages(cls, pages):
+        """
+        Creates a query over the results of raw SWAPI pages.
+
+        :param pages: a function that takes no arguments and returns an iterable of raw pages
+        :return: a query
+        """
+        return cls(lambda: itertools.chain.from_iterable(page.get("results", []) for page in pages()))
+
+    def __iter__(self):
+        return iter(self._source())
+
+    def where(self, predicate):
+        """
+        :param predicate: a function returning True for the items to keep
+        :return: a query
+        """
+        return Query(lambda: filter(predicate, self))
+
+    def map(self, func):
+        """
+        :param func: a function applied to every item
+        :return: a query
+        """
+        return Query(lambda: map(func, self))
+
+    def flat_map(self, func):
+        """
+        :param func: a function returning an iterable for every item - those are chained together
+        :return: a query
+        """
+        return Query(lambda: itertools.chain.from_iterable(map(func, self)))
+
+    def distinct(self, key=None):
+        """
+        :param key: optional function used to compute the value used to tell items apart
+        :return: a query that skips items that were already seen
+        """
+
+        def unique_items():
+            seen = set()
+            for item in self:
+                item_key = item if key is None else key(item)
+                if item_key not in seen:
+                    seen.add(item_key)
+                    yield item
+
+        return Query(unique_items)
+
+    def limit(self, count):
+        """
+        :param count: maximum number of items
+        :return: a query that stops after `count` items
+        """
+        return Query(lambda: itertools.islice(self, count))
+
+    def first(self, default=None):
+        """
+        :param default: returned if the query has no results
+        :return: the first result of the query
+        """
+        return next(iter(self), default)
@@ -0,0 +1,88 @@
+"""Client-side rate limiting"""
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens are added at `rate` tokens per second, up to `burst` tokens, and every
+    request takes one. When the bucket is empty, requests wait for their turn.
+
+    The rate adapts to the API: every throttled (429) response cuts the rate down
+    (multiplicatively), and every successful response slowly brings it back up
+    (additively) to the configured rate.
+    """
+
+    def __init__(self, rate, burst=1, *, min_rate=0.5, slowdown=0.5, recovery=0.1):
+        """
+        :param rate: number of requests per second
+        :param burst: number of requests that can be made at once, after being idle
+        :param min_rate: the rate is never slowed down below this
+        :param slowdown: factor applied to the rate on every throttled response
+        :param recovery: requests per second added back on every successful response
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.slowdown = slowdown
+        self.recovery = recovery
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self):
+        """
+        Takes a token, possibly one that has not been added yet.
+
+        :return: number of seconds to wait before the token is actually available
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Blocks until a request can be made"""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def throttled(self, retry_after=None):
+        """
+        Slows down after the API rejected a request for going too fast.
+
+        :param retry_after: optional number of seconds the API asked us to wait
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.min_rate, self.rate * self.slowdown)
+            if retry_after:
+                # nobody gets a token until the API is ready for us again
+                self._tokens = min(self._tokens, -retry_after * self.rate)
+
+    def succeeded(self):
+        """Speeds back up (gradually) after a successful request"""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill(time.monotonic())
+                self.rate = min(self.max_rate, self.rate + self.recovery)
+
+
+class AsyncTokenBucket(TokenBucket):
+    """Token bucket rate limiter, for use with asyncio"""
+
+    async def acquire(self):
+        """Waits (without blocking the event loop) until a request can be made"""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
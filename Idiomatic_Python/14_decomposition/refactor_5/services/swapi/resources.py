@@ -0,0 +1,44 @@
+"""Helpers for working with SWAPI resources"""
+
+
+def resource_key(url):
+    """
+    Normalizes a resource url, so it can be used as a lookup key
+
+    :param url: a SWAPI url (with or without a trailing slash)
+    :return: the url without its trailing slash
+    """
+    return url.rstrip("/")
+
+
+def resource_kind(url, base_url):
+    """
+    :param url: a SWAPI url, e.g. https://swapi.dev/api/films/1/
+    :param base_url: the root url of the API
+    :return: the kind of resource the url refers to, e.g. "films"
+    """
+    path = resource_key(url)[len(resource_key(base_url)):]
+    return path.strip("/").split("/")[0].split("?")[0]
+
+
+def resource_id(url, base_url):
+    """
+    :param url: a SWAPI url, e.g. https://swapi.dev/api/films/1/
+    :param base_url: the root url of the API
+    :return: the id of the single resource the url refers to, e.g. "1" - or None for
+        the url of a list of resources (or the API root)
+    """
+    path = resource_key(url.split("?")[0])[len(resource_key(base_url)):]
+    parts = path.strip("/").split("/")
+    return parts[1] if len(parts) > 1 else None
+
+
+def cargo_capacity(resource):
+    """
+    :param resource: a SWAPI resource (e.g. a starship)
+    :return: the numeric cargo capacity, or None if the resource has none
+    """
+    try:
+        return int(resource["cargo_capacity"])
+    except (KeyError, ValueError):
+        return None
@@ -1,5 +1,178 @@
-"""Utilities for a timeout retry decorator"""
-from requests.exceptions import Timeout, RequestException
+"""Utilities for retrying API queries"""
+import email.utils
+import random
+import threading
+import time
+
+from requests.exceptions import ConnectionError, RequestException, Timeout
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class RetryBudget:
+    """
+    Limits retries to a fraction of the queries made, shared across all calls.
+
+    Every query deposits `ratio` tokens (up to `max_tokens`), and every retry needs to
+    withdraw a whole token. When the API is struggling and most queries fail, retries
+    quickly run out, instead of multiplying the load on the API (a "retry storm").
+    """
+
+    def __init__(self, ratio=0.2, max_tokens=10):
+        """
+        :param ratio: number of retries allowed per query, on average
+        :param max_tokens: maximum number of retries that can be saved up
+        """
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self):
+        """
+        :return: True if a retry is allowed, False if the budget is exhausted
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """
+    Retries queries that time out, fail to connect, or come back with a 429/5xx status.
+
+    Retries back off exponentially, with full jitter (the delay is a random value
+    between 0 and the exponential backoff), or wait for as long as the `Retry-After`
+    header asks. The state of each call is kept local to that call, so a single
+    policy can be shared by any number of calls (and threads).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts=5,
+        initial_timeout=1,
+        base_delay=0.5,
+        max_delay=30,
+        deadline=None,
+        retry_statuses=RETRY_STATUSES,
+        budget=None,
+    ):
+        """
+        :param max_attempts: maximum number of attempts for a single call
+        :param initial_timeout: the initial timeout, gets doubled on every attempt
+        :param base_delay: backoff (seconds) before the first retry, gets doubled on every attempt
+        :param max_delay: maximum backoff (seconds) between two attempts
+        :param deadline: optional total time (seconds) a call may take, across all attempts
+        :param retry_statuses: HTTP status codes that are retried
+        :param budget: optional `RetryBudget` shared with other calls
+        """
+        self.max_attempts = max_attempts
+        self.initial_timeout = initial_timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_statuses = retry_statuses
+        self.budget = budget
+
+    def __call__(self, fn):
+        """
+        Decorates a function with this retry policy.
+
+        :param fn: a function that accepts a `timeout` keyword argument, such as `requests.get`
+        :return: decorated function
+        """
+
+        def inner(*args, **kwargs):
+            return self.call(fn, *args, **kwargs)
+
+        return inner
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Calls `fn`, retrying as needed.
+
+        :return: the response of the last attempt - a response with a retryable status is
+            returned as is once retries are exhausted, so the caller can raise for it
+        """
+        started = time.monotonic()
+        if self.budget is not None:
+            self.budget.deposit()
+
+        attempt_number = 1
+        while True:
+            timeout = self.initial_timeout * 2 ** (attempt_number - 1)
+            remaining = self._remaining(started)
+            if remaining is not None:
+                timeout = min(timeout, remaining)
+
+            print(f"\tattempt #{attempt_number}")
+            try:
+                response = fn(*args, **kwargs, timeout=timeout)
+            except (Timeout, ConnectionError) as ex:
+                response, error = None, ex
+            else:
+                if response.status_code not in self.retry_statuses:
+                    return response
+                error = None
+
+            delay = self._delay(attempt_number, response)
+            if not self._can_retry(attempt_number, delay, started):
+                if error is not None:
+                    raise RequestException("Max attempts exceeded") from error
+                return response
+
+            reason = f"status {response.status_code}" if error is None else type(error).__name__
+            print(f"\t\tRequest failed ({reason}). Trying again in {delay:.2f} s.")
+            time.sleep(delay)
+            attempt_number += 1
+
+    def _remaining(self, started):
+        if self.deadline is None:
+            return None
+        return self.deadline - (time.monotonic() - started)
+
+    def _delay(self, attempt_number, response):
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return retry_after
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt_number - 1))
+        return random.uniform(0, backoff)
+
+    def _can_retry(self, attempt_number, delay, started):
+        if attempt_number >= self.max_attempts:
+            return False
+        remaining = self._remaining(started)
+        if remaining is not None and delay >= remaining:
+            return False
+        return self.budget is None or self.budget.withdraw()
+
+
+def parse_retry_after(value):
+    """
+    Parses a `Retry-After` header
+
+    :param value: the header value, either a number of seconds or an HTTP date
+    :return: number of seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
 
 
 def timeout_retry(max_attempts, initial_timeout):
@@ -10,13 +183,13 @@ def timeout_retry(max_attempts, initial_timeout):
     :param initial_timeout: the initial timeout, gets doubled if query times out
     :return: decorator function
     """
-    attempt_number = 1
-    current_timeout = initial_timeout
 
     def decorator(fn):
         def inner(*args, **kwargs):
-            nonlocal attempt_number
-            nonlocal current_timeout
+            # keep the attempt state local to each call, so the decorated
+            # function can safely be called more than once
+            attempt_number = 1
+            current_timeout = initial_timeout
 
             while True:
                 try:
@@ -34,5 +207,3 @@ def timeout_retry(max_attempts, initial_timeout):
 
         return inner
     return decorator
-
-
@@ -1,5 +1,21 @@
 """Various utility functions used in SWAPI app"""
 
+def has_min_capacity(ship, min_capacity):
+    """
+    Checks if a ship has some minimum capacity
+
+    :param ship: a ship object
+    :param min_capacity: the minimum capacity (inclusive)
+    :return: True if the ship has a numeric cargo capacity of at least `min_capacity`
+    """
+    try:
+        cargo_capacity = int(ship["cargo_capacity"])
+    except (KeyError, ValueError):
+        # could not get a numeric cargo capacity
+        return False
+    return cargo_capacity >= min_capacity
+
+
 def filter_ships_by_capacity(ships, min_capacity):
     """
     Filters a list of ships based on some minimum capacity
@@ -9,15 +25,20 @@ def filter_ships_by_capacity(ships, min_capacity):
     :return: a generator of ships
     """
     for ship in ships:
-        try:
-            cargo_capacity = int(ship["cargo_capacity"])
-        except (KeyError, ValueError):
-            # could not get a numeric cargo capacity, skip this ship
-            continue
-        if cargo_capacity >= min_capacity:
+        if has_min_capacity(ship, min_capacity):
             yield ship
 
 
+def film_urls(ship):
+    """
+    Extracts the film URLs of a single ship
+
+    :param ship: a ship object
+    :return: a list of film URLs (empty if the ship has none)
+    """
+    return ship.get("films") or []
+
+
 def extract_film_urls(ships):
     """
     For some iterable of ships, extracts the film URLs
@@ -26,5 +47,4 @@ def extract_film_urls(ships):
     :return: a generator (of potentially non-unique) film URLs
     """
     for ship in ships:
-        if ship.get("films"):
-            yield from ship["films"]
+        yield from film_urls(ship)